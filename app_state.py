@@ -0,0 +1,191 @@
+"""Per-session state shared by every page.
+
+``init_session`` sets up ``st.session_state`` defaults on each rerun,
+``account_sidebar`` handles the Username box and ``language_sidebar`` the
+language pair the session studies.  The helpers below change
+progress in the session and mirror the change to the progress store when a
+user is signed in.
+"""
+import time
+
+import streamlit as st
+
+from chat_history import ChatHistory, Message
+from content_store import get_store
+from languages import DEFAULT_PAIR, content_languages, language_name
+from progress_bits import ProgressBits
+from progress_store import get_progress_store
+from srs import CardCatalog, Deck
+
+
+# ---------- Content ----------
+# Parsed once per process and shared by every session; reloaded only when the
+# JSON files change on disk.
+def content():
+    return get_store().content()
+
+
+def card_catalog():
+    """Card numbering for spaced repetition; built only by the paths that review cards."""
+    return content().derived("srs_catalog", CardCatalog)
+
+
+# ---------- Session state ----------
+def init_session():
+    # Completed lesson ids, as a bitset over the current catalog
+    completed = st.session_state.get("completed")
+    if isinstance(completed, ProgressBits):
+        st.session_state.completed = completed.rebase(content())
+    else:
+        st.session_state.completed = ProgressBits.for_content(content(), completed or ())
+    if "chat_history" not in st.session_state:
+        st.session_state.chat_history = ChatHistory()   # chatbot messages, older ones archived to disk
+    if "user_id" not in st.session_state:
+        st.session_state.user_id = None          # set once a username is entered
+    if "native_lang" not in st.session_state:
+        st.session_state.native_lang, st.session_state.learning_lang = DEFAULT_PAIR
+    if "deck" not in st.session_state:
+        st.session_state.deck = None             # built by deck() on first use
+        st.session_state.saved_cards = ()        # card rows loaded at sign-in, applied by deck()
+
+
+def deck():
+    """The session's spaced-repetition deck over the current catalog."""
+    catalog = card_catalog()
+    current = st.session_state.deck
+    if current is None:
+        current = Deck.for_catalog(catalog, st.session_state.saved_cards)
+        st.session_state.saved_cards = ()
+    else:
+        current = current.rebase(catalog)
+    st.session_state.deck = current
+    return current
+
+
+# ---------- Account (server-side progress) ----------
+def account_sidebar():
+    username = st.sidebar.text_input("Username", key="username",
+                                     help="Your progress and chat are saved on the server under this name.").strip()
+    if username and st.session_state.get("user_name") != username:
+        progress_store = get_progress_store()
+        user_id = progress_store.get_or_create_user(username)
+        saved = progress_store.load_user(user_id)
+        if st.session_state.user_id is None:
+            # Keep anything done before signing in; saved state wins where both exist
+            progress_store.mark_completed(user_id, st.session_state.completed - saved["completed"])
+            st.session_state.completed = saved["completed"] | st.session_state.completed
+            saved_keys = {(lid, index) for lid, index, *_ in saved["cards"]}
+            anonymous = st.session_state.deck.rows() if st.session_state.deck is not None else []
+            new_cards = [row for row in anonymous if (row[0], row[1]) not in saved_keys]
+            progress_store.save_cards(user_id, new_cards)
+            _set_cards(list(saved["cards"]) + new_cards)
+            history = st.session_state.chat_history
+            new_chat = [(m.role, m.text) for m in history.window(len(history))]
+            for role, text in new_chat:
+                progress_store.append_chat(user_id, role, text)
+            _set_chat(list(saved["chat"]) + new_chat)
+        else:
+            # Switching users: nothing of the previous user's carries over
+            _reset_progress(saved)
+        st.session_state.user_id = user_id
+        st.session_state.user_name = username
+    elif not username and st.session_state.user_id is not None:
+        _reset_progress()
+        st.session_state.user_id = None
+        st.session_state.user_name = None
+    if st.session_state.user_id is not None:
+        st.sidebar.caption(f"Signed in as **{username}** — progress is saved automatically.")
+
+
+def _set_chat(messages):
+    st.session_state.chat_history.clear()      # drops the previous archive file
+    history = st.session_state.chat_history = ChatHistory()
+    history.extend(Message(role, text) for role, text in messages)
+
+
+def _set_cards(rows):
+    st.session_state.deck = None
+    st.session_state.saved_cards = rows
+
+
+def _reset_progress(saved=None):
+    """Replace the session's progress with ``saved`` (a ``load_user`` result), or with nothing."""
+    saved = saved or {"completed": (), "chat": (), "cards": ()}
+    st.session_state.completed = ProgressBits.for_content(content(), saved["completed"])
+    _set_cards(saved["cards"])
+    _set_chat(saved["chat"])
+
+
+# ---------- Languages ----------
+def language_pair():
+    """``(native, learning)`` language codes of this session."""
+    return st.session_state.native_lang, st.session_state.learning_lang
+
+
+def language_sidebar():
+    languages = content_languages(content())
+    if len(languages) < 2:
+        return
+    # Content reloads can drop a language; fall back before the widgets check their options
+    if st.session_state.native_lang not in languages:
+        st.session_state.native_lang = DEFAULT_PAIR[0] if DEFAULT_PAIR[0] in languages else languages[0]
+    native = st.sidebar.selectbox("I speak", languages, key="native_lang", format_func=language_name)
+    learning_options = [lang for lang in languages if lang != native]
+    if st.session_state.learning_lang not in learning_options:
+        st.session_state.learning_lang = DEFAULT_PAIR[1] if DEFAULT_PAIR[1] in learning_options else learning_options[0]
+    st.sidebar.selectbox("I'm learning", learning_options, key="learning_lang", format_func=language_name)
+
+
+# ---------- Progress helpers ----------
+def save_cards(cards):
+    if st.session_state.user_id is not None:
+        current = deck()
+        catalog = card_catalog()
+        get_progress_store().save_cards(
+            st.session_state.user_id, [(*catalog.keys[c], *current.state(c)) for c in cards])
+
+
+def introduce_lessons(lesson_ids):
+    """Queue every item of these lessons for review."""
+    catalog = card_catalog()
+    current = deck()
+    cards = [c for lid in lesson_ids for c in catalog.by_lesson.get(lid, ())
+             if not current.is_introduced(c)]
+    current.introduce(cards)
+    save_cards(cards)
+
+
+def review_cards(graded):
+    """Feed (card, grade) results from lessons/quizzes into the scheduler."""
+    now = time.time()
+    current = deck()
+    for card, grade in graded:
+        current.review(card, grade, now)
+    save_cards([card for card, _ in graded])
+
+
+def mark_completed(*lesson_ids):
+    st.session_state.completed.update(lesson_ids)
+    introduce_lessons(lesson_ids)
+    if st.session_state.user_id is not None:
+        get_progress_store().mark_completed(st.session_state.user_id, lesson_ids)
+
+
+def set_completed(lesson_ids):
+    st.session_state.completed = ProgressBits.for_content(content(), lesson_ids)
+    if st.session_state.user_id is not None:
+        get_progress_store().replace_completed(st.session_state.user_id, st.session_state.completed)
+
+
+def add_chat_turn(user_text, bot_text):
+    st.session_state.chat_history.add_turn(user_text, bot_text)
+    if st.session_state.user_id is not None:
+        progress_store = get_progress_store()
+        progress_store.append_chat(st.session_state.user_id, "user", user_text)
+        progress_store.append_chat(st.session_state.user_id, "bot", bot_text)
+
+
+def clear_chat():
+    st.session_state.chat_history.clear()
+    if st.session_state.user_id is not None:
+        get_progress_store().clear_chat(st.session_state.user_id)
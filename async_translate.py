@@ -0,0 +1,70 @@
+"""Non-blocking translation for the UI.
+
+``submit`` hands the request to a shared background pool and returns a
+Future immediately, so a Streamlit rerun never sits on a slow upstream call.
+Identical requests that are still in flight, from this session or any other,
+get the same Future and cost one upstream call.  A caller that no longer
+needs a result calls ``release`` with its Future; the request is cancelled
+once nobody is waiting for it and it has not started yet.  A shared Future
+can therefore be cancelled under another caller, who sees
+``CancelledError`` from ``result()`` and should treat it as no result.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from translation_cache import normalize_text
+from translator import translate_text
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="translate-ui")
+_inflight = {}                 # (text, source, target) -> Future
+_refs = {}                     # (text, source, target) -> number of callers waiting
+_lock = threading.Lock()
+stats = {"submitted": 0, "shared": 0, "cancelled": 0}
+
+
+def submit(text: str, target: str = "de", source: str = None):
+    """Future resolving to ``translate_text(text, target, source)``."""
+    key = (normalize_text(text), source, target)
+    with _lock:
+        fut = _inflight.get(key)
+        if fut is not None:
+            _refs[key] += 1
+            stats["shared"] += 1
+            return fut
+        fut = _executor.submit(translate_text, text, target, source)
+        _inflight[key] = fut
+        _refs[key] = 1
+        stats["submitted"] += 1
+
+    def forget(done_fut):
+        with _lock:
+            if _inflight.get(key) is done_fut:
+                del _inflight[key]
+                del _refs[key]
+
+    fut.add_done_callback(forget)
+    return fut
+
+
+def release(fut, text: str, target: str = "de", source: str = None):
+    """Drop one caller's interest in the Future ``submit`` gave it; cancel it if it was the last."""
+    key = (normalize_text(text), source, target)
+    with _lock:
+        # Finished and forgotten, possibly with a newer request for the same text in flight
+        if _inflight.get(key) is not fut:
+            return
+        _refs[key] -= 1
+        if _refs[key] > 0:
+            return
+        # Nobody is waiting: a later submit starts afresh instead of sharing this one
+        del _inflight[key]
+        del _refs[key]
+    # Outside the lock: cancel() runs the done callbacks synchronously
+    if fut.cancel():
+        with _lock:
+            stats["cancelled"] += 1
+
+
+def inflight() -> int:
+    with _lock:
+        return len(_inflight)
@@ -0,0 +1,351 @@
+"""Translation backends and the chain that runs them.
+
+Every backend answers ``translate(text, source, target)`` with a string, or
+``None`` when it has no translation.  Remote backends raise ``BackendError`` on
+transport/HTTP failures and API error replies so their circuit breaker can
+count them.  Any other exception from a backend is logged and counted as a
+failure too.
+
+``BackendChain`` walks the backends in the configured order.  Local lookups
+run inline.  Remote backends run on a shared thread pool.  If a remote backend
+has not answered within ``hedge_delay`` seconds, the chain starts the next
+backend too and returns the first answer from either one.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import local_model
+import metrics
+from phrase_index import PhraseIndex
+
+log = logging.getLogger("lingo.backends")
+
+class BackendError(Exception):
+    """A backend failed (network error, bad status, unparsable body)."""
+
+
+# ---------- Circuit breaker ----------
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open, ``allow()`` is False.  After ``reset_timeout`` seconds the
+    breaker lets one trial call through (half-open).  If the trial succeeds
+    the breaker closes again; if it fails the breaker re-opens.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+# ---------- HTTP session ----------
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """One keep-alive ``requests.Session`` shared by all remote backends.
+
+    ``requests`` is imported here rather than at module level; it is the
+    slowest import on the translator path and local lookups never need it.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+# ---------- Backends ----------
+class Backend:
+    """Base class.  ``pairs`` declares the (source, target) pairs served; None means any."""
+    name = "backend"
+    remote = False        # remote backends run on the pool and can be hedged
+    cacheable = False     # results go through the shared translation cache
+    pairs = None
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+
+    def supports(self, source: str, target: str) -> bool:
+        return source != target and (self.pairs is None or (source, target) in self.pairs)
+
+    def translate(self, text: str, source: str, target: str):
+        raise NotImplementedError
+
+
+class LibreTranslateBackend(Backend):
+    name = "libretranslate"
+    remote = True
+    cacheable = True
+
+    def __init__(self, url="https://libretranslate.com/translate", timeout=8):
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+
+    def translate(self, text, source, target):
+        try:
+            resp = get_session().post(
+                self.url,
+                json={"q": text, "source": source or "auto", "target": target, "format": "text"},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            return resp.json().get("translatedText") or None
+        except (OSError, ValueError) as e:     # RequestException is an OSError
+            raise BackendError(f"{self.name}: {e}") from e
+
+
+class MyMemoryBackend(Backend):
+    name = "mymemory"
+    remote = True
+    cacheable = True
+
+    def __init__(self, url="https://api.mymemory.translated.net/get", timeout=8):
+        super().__init__()
+        self.url = url
+        self.timeout = timeout
+
+    def translate(self, text, source, target):
+        try:
+            resp = get_session().get(
+                self.url, params={"q": text, "langpair": f"{source}|{target}"}, timeout=self.timeout
+            )
+            resp.raise_for_status()
+            data = resp.json()
+        except (OSError, ValueError) as e:     # RequestException is an OSError
+            raise BackendError(f"{self.name}: {e}") from e
+        # Quota and request errors come back as HTTP 200 with the message as the "translation"
+        status = data.get("responseStatus", 200)
+        if str(status) != "200":
+            raise BackendError(f"{self.name}: status {status}: {data.get('responseDetails') or ''}")
+        return (data.get("responseData") or {}).get("translatedText") or None
+
+
+class LocalDictBackend(Backend):
+    """Exact (normalized) lookup in a small en->de dictionary, both directions."""
+    name = "dict"
+
+    def __init__(self, en_de: dict):
+        super().__init__()
+        self.index = PhraseIndex.from_pairs(en_de.items(), fuzzy=False)
+
+    def supports(self, source, target):
+        return self.index.supports(source, target)
+
+    def translate(self, text, source, target):
+        return self.index.lookup(text, source, target)
+
+
+class LessonCorpusBackend(Backend):
+    """Exact-then-fuzzy lookup in the phrase index built from lesson content.
+
+    ``get_index(source, target)`` and ``get_languages()`` are called per lookup,
+    so the backend follows content reloads.  They are expected to return
+    cached values (see ``Content.derived``), and indexes are built per
+    language pair on first use.
+    """
+    name = "lessons"
+
+    def __init__(self, get_index, get_languages):
+        super().__init__()
+        self.get_index = get_index
+        self.get_languages = get_languages
+
+    def supports(self, source, target):
+        languages = self.get_languages()
+        return source != target and source in languages and target in languages
+
+    def translate(self, text, source, target):
+        return self.get_index(source, target).lookup(text, source, target)
+
+
+class LocalModelBackend(Backend):
+    name = "local_model"
+    remote = True         # not network, but slow enough to be worth hedging
+    cacheable = True
+
+    def supports(self, source, target):
+        return local_model.supports(source, target)
+
+    def translate(self, text, source, target):
+        return local_model.translate(text, source, target)
+
+
+# ---------- Chain ----------
+BACKEND_SECONDS = metrics.Histogram(
+    "lingo_backend_seconds", "Time spent in one backend call", ("backend", "outcome"))
+BACKEND_SKIPPED = metrics.Counter(
+    "lingo_backend_skipped_total", "Backend calls skipped because its circuit breaker was open", ("backend",))
+BACKEND_CACHE_HITS = metrics.Counter(
+    "lingo_backend_cache_hits_total", "Translations served from the cache instead of the backend", ("backend",))
+TRANSLATIONS = metrics.Counter(
+    "lingo_translations_total", "Chain results by the backend that answered (none = no answer)",
+    ("backend", "source", "target"))
+CHAIN_SECONDS = metrics.Histogram(
+    "lingo_chain_seconds", "End-to-end BackendChain.translate time", ("source", "target"))
+
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="translate")
+
+
+class BackendChain:
+    """Runs backends in order; pivots through ``pivot`` when no backend pairs source and target."""
+
+    def __init__(self, backends, cache=None, hedge_delay=1.5, timeout=10.0, executor=None, pivot="en"):
+        self.backends = list(backends)
+        self.cache = cache
+        self.hedge_delay = hedge_delay
+        self.timeout = timeout
+        self.executor = executor or _executor
+        self.pivot = pivot
+
+    def _call(self, backend, text, source, target):
+        """Run one backend, updating its breaker and the cache."""
+        started = time.perf_counter()
+        try:
+            result = backend.translate(text, source, target)
+        except Exception as e:
+            # Anything escaping a backend must still end a half-open trial
+            if not isinstance(e, BackendError):
+                log.exception("%s raised unexpectedly", backend.name)
+            backend.breaker.record_failure()
+            BACKEND_SECONDS.observe(time.perf_counter() - started, backend.name, "error")
+            return None
+        backend.breaker.record_success()
+        BACKEND_SECONDS.observe(time.perf_counter() - started, backend.name, "hit" if result else "miss")
+        if result and backend.cacheable and self.cache is not None:
+            self.cache.put(text, source, target, backend.name, result)
+        return result
+
+    def translate(self, text: str, source: str, target: str, looked_up=False):
+        """Return ``(translation, backend_name)`` or ``(None, None)``.
+
+        ``looked_up=True`` means ``lookup`` already missed for this text, so the
+        cache and the inline backends are not asked again.
+        """
+        with CHAIN_SECONDS.time(source, target):
+            result, name = self._translate(text, source, target, remote_only=looked_up)
+            if result is None and self.pivot and self.pivot not in (source, target):
+                result, name = self._via_pivot(text, source, target)
+        TRANSLATIONS.inc(name or "none", source, target)
+        return result, name
+
+    def lookup(self, text: str, source: str, target: str):
+        """Like ``translate``, but only from the cache and inline (non-remote) backends.
+
+        Never waits on the network or the local model, which counts as remote.
+        """
+        for backend in self.backends:
+            if not backend.supports(source, target):
+                continue
+            if backend.cacheable and self.cache is not None:
+                cached = self.cache.get(text, source, target, backend.name)
+                if cached:
+                    BACKEND_CACHE_HITS.inc(backend.name)
+                    TRANSLATIONS.inc(backend.name, source, target)
+                    return cached, backend.name
+            if not backend.remote and backend.breaker.allow():
+                result = self._call(backend, text, source, target)
+                if result:
+                    TRANSLATIONS.inc(backend.name, source, target)
+                    return result, backend.name
+        return None, None
+
+    def _via_pivot(self, text, source, target):
+        middle, first = self._translate(text, source, self.pivot)
+        if not middle:
+            return None, None
+        result, second = self._translate(middle, self.pivot, target)
+        if not result:
+            return None, None
+        return result, f"{first}+{second}"
+
+    def _translate(self, text, source, target, remote_only=False):
+        candidates = [b for b in self.backends if b.supports(source, target) and (b.remote or not remote_only)]
+        pending = {}
+        deadline = time.monotonic() + self.timeout
+
+        def launch_next():
+            # Start backends in order until one is pending on the pool or one
+            # answers inline.  Returns an inline answer, if any.
+            while candidates:
+                backend = candidates.pop(0)
+                if backend.cacheable and self.cache is not None and not remote_only:
+                    cached = self.cache.get(text, source, target, backend.name)
+                    if cached:
+                        BACKEND_CACHE_HITS.inc(backend.name)
+                        return cached, backend.name
+                if not backend.breaker.allow():
+                    BACKEND_SKIPPED.inc(backend.name)
+                    continue
+                if not backend.remote:
+                    result = self._call(backend, text, source, target)
+                    if result:
+                        return result, backend.name
+                    continue
+                pending[self.executor.submit(self._call, backend, text, source, target)] = backend
+                return None
+            return None
+
+        while True:
+            if not pending or candidates:
+                answer = launch_next()
+                if answer:
+                    return answer
+            if not pending:
+                return None, None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, None
+            wait_for = min(self.hedge_delay, remaining) if candidates else remaining
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for fut in done:
+                backend = pending.pop(fut)
+                result = fut.result()
+                if result:
+                    return result, backend.name
@@ -0,0 +1,241 @@
+"""Headless batch translation of text, CSV or JSONL files.
+
+    python batch_translate.py input.txt output.txt --target de
+    python batch_translate.py phrases.csv out.csv --column en --target de --workers 16
+    python batch_translate.py data.jsonl out.jsonl --field text --target en --resume
+
+The input is streamed record by record.  At most ``--workers`` x 4 records
+are in flight at once, through the same backend chain and translation cache
+as the app.  Results are written in input order as soon as they are ready, so
+memory stays flat on multi-GB files.  Repeated inputs share one translation.
+A checkpoint (``<output>.ckpt``) records how many records have been written,
+the output size, and the input's path and size.  ``--resume`` truncates the
+output to that point and skips the records already done.  It refuses to
+resume when the input or the output no longer matches the checkpoint.  A run
+without ``--resume`` deletes any old checkpoint first.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from languages import default_source
+from translation_cache import normalize_text
+from translator import get_chain
+
+CHECKPOINT_EVERY = 500            # records
+REPORT_EVERY = 5.0                # seconds
+DEDUP_WINDOW = 100_000            # distinct inputs remembered for in-run dedup
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    return {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}.get(ext, "text")
+
+
+# ---------- record readers / writers ----------
+def read_records(f, fmt, column=None, field="text"):
+    """Yield ``(text, record)`` pairs; ``record`` is whatever the writer needs."""
+    if fmt == "text":
+        for line in f:
+            line = line.rstrip("\n")
+            yield line, line
+    elif fmt == "csv":
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        index = header.index(column) if column in header else int(column or 0)
+        yield None, header                       # header pseudo-record
+        for row in reader:
+            yield (row[index] if index < len(row) else ""), row
+    elif fmt == "jsonl":
+        for line in f:
+            if line.strip():
+                obj = json.loads(line)
+                yield str(obj.get(field, "")), obj
+    else:
+        raise ValueError(f"unknown format {fmt!r}")
+
+
+def _csv_line(row):
+    buf = io.StringIO()
+    csv.writer(buf).writerow(row)
+    return buf.getvalue().encode("utf-8")
+
+
+def encode_record(fmt, record, translation, out_field="translation"):
+    if fmt == "text":
+        return (translation.replace("\n", " ") + "\n").encode("utf-8")
+    if fmt == "csv":
+        return _csv_line(record + [translation])
+    record = dict(record)
+    record[out_field] = translation
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+# ---------- checkpoint ----------
+def load_checkpoint(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_checkpoint(path, records, output_bytes, input_path, input_bytes):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"records": records, "output_bytes": output_bytes,
+                   "input": os.path.abspath(input_path), "input_bytes": input_bytes}, f)
+    os.replace(tmp, path)
+
+
+def checkpoint_problem(ckpt, input_path, input_bytes, output_path):
+    """Why ``ckpt`` cannot be resumed from, or None."""
+    if ckpt.get("input") != os.path.abspath(input_path) or ckpt.get("input_bytes") != input_bytes:
+        return f"checkpoint is for {ckpt.get('input')!r} ({ckpt.get('input_bytes')} bytes), " \
+               f"not {os.path.abspath(input_path)!r} ({input_bytes} bytes)"
+    try:
+        output_bytes = os.path.getsize(output_path)
+    except OSError:
+        output_bytes = 0
+    if output_bytes < ckpt["output_bytes"]:
+        return f"{output_path} has {output_bytes} bytes, fewer than the {ckpt['output_bytes']} checkpointed"
+    return None
+
+
+# ---------- pipeline ----------
+class Deduper:
+    """Maps normalized input -> Future so duplicates share one translation."""
+
+    def __init__(self, executor, translate, size=DEDUP_WINDOW):
+        self.executor = executor
+        self.translate = translate
+        self.size = size
+        self.futures = OrderedDict()
+        self.shared = 0
+
+    def submit(self, text):
+        key = normalize_text(text)
+        fut = self.futures.get(key)
+        if fut is not None:
+            self.futures.move_to_end(key)
+            self.shared += 1
+            return fut
+        fut = self.executor.submit(self.translate, text)
+        self.futures[key] = fut
+        if len(self.futures) > self.size:
+            self.futures.popitem(last=False)
+        return fut
+
+
+def run(args):
+    fmt = args.format or detect_format(args.input)
+    checkpoint_path = args.output + ".ckpt"
+    # Open the input before touching the output, so a wrong path leaves the old output alone
+    f = open(args.input, "r", encoding="utf-8", newline="" if fmt == "csv" else None)
+    input_bytes = os.fstat(f.fileno()).st_size
+    skip, offset = 0, 0
+    if args.resume:
+        ckpt = load_checkpoint(checkpoint_path)
+        if ckpt:
+            problem = checkpoint_problem(ckpt, args.input, input_bytes, args.output)
+            if problem:
+                f.close()
+                print(f"Cannot resume: {problem}. Run without --resume to start over.", file=sys.stderr)
+                return 2
+            skip, offset = ckpt["records"], ckpt["output_bytes"]
+    else:
+        try:
+            os.remove(checkpoint_path)
+        except FileNotFoundError:
+            pass
+    out = open(args.output, "r+b" if offset else "wb")
+    out.seek(offset)
+    out.truncate()
+
+    chain = get_chain()
+    source = args.source or default_source(args.target)
+    failures = 0
+
+    def translate(text):
+        if not text.strip():
+            return ""
+        translated, _ = chain.translate(text.strip(), source, args.target)
+        return translated
+
+    done = skip
+    started = last_report = time.monotonic()
+    window = deque()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor, f:
+        dedup = Deduper(executor, translate)
+
+        def drain(limit):
+            nonlocal done, failures, last_report
+            while len(window) > limit:
+                fut, record = window.popleft()
+                if fut is None:                  # CSV header
+                    out.write(_csv_line(record + [args.out_field]))
+                    continue
+                translation = fut.result()
+                if translation is None:
+                    failures += 1
+                out.write(encode_record(fmt, record, translation or "", args.out_field))
+                done += 1
+                if done % CHECKPOINT_EVERY == 0:
+                    out.flush()
+                    save_checkpoint(checkpoint_path, done, out.tell(), args.input, input_bytes)
+                now = time.monotonic()
+                if now - last_report >= REPORT_EVERY:
+                    last_report = now
+                    rate = (done - skip) / (now - started)
+                    print(f"{done} records, {rate:.1f}/s, {dedup.shared} deduplicated, {failures} failed",
+                          file=sys.stderr)
+
+        position = 0
+        for text, record in read_records(f, fmt, args.column, args.field):
+            if text is None:                     # CSV header
+                if offset == 0:
+                    window.append((None, record))
+                continue
+            position += 1
+            if position <= skip:
+                continue
+            window.append((dedup.submit(text), record))
+            drain(args.workers * 4)
+        drain(0)
+    out.flush()
+    save_checkpoint(checkpoint_path, done, out.tell(), args.input, input_bytes)
+    out.close()
+
+    elapsed = time.monotonic() - started
+    processed = done - skip
+    print(f"Done: {processed} records in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:.1f}/s), "
+          f"{dedup.shared} deduplicated, {failures} failed", file=sys.stderr)
+    return 0 if not failures else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Translate a text/CSV/JSONL file record by record.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--format", choices=("text", "csv", "jsonl"), help="default: from the input extension")
+    parser.add_argument("--target", default="de")
+    parser.add_argument("--source", help="default: en for --target de, otherwise de")
+    parser.add_argument("--column", help="CSV column name or index to translate (default: first)")
+    parser.add_argument("--field", default="text", help="JSONL field to translate")
+    parser.add_argument("--out-field", default="translation", help="CSV header / JSONL field for the result")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--resume", action="store_true", help="continue from <output>.ckpt")
+    args = parser.parse_args(argv)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Compare the compiled intent matcher with the original if/elif keyword chain.
+
+    python benchmarks/bench_chatbot.py [--messages 20000]
+
+The legacy chain below reproduces the original ``get_german_response``
+branches (substring ``in`` tests, first match wins), minus the random
+fallback, so both sides only do intent selection.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chatbot import IntentMatcher  # noqa: E402
+
+LEGACY_CHAIN = [
+    ("greeting", ["hallo", "hi", "hello", "guten tag", "moin", "guten morgen"]),
+    ("how_are_you", ["wie geht"]),
+    ("thanks", ["danke", "dankeschön", "danke schön", "thanks", "thank you"]),
+    ("goodbye", ["tschüss", "auf wiedersehen", "bye", "ciao", "tschau", "goodbye"]),
+    ("name", ["wie heißt", "dein name", "wer bist", "name", "what's your name"]),
+    ("help", ["hilfe", "help", "was kannst", "what can you do"]),
+    ("likes", ["gefall", "magst", "like", "do you like"]),
+    ("which_language", ["welche sprache", "which language", "sprichst du"]),
+    ("free_time", ["freizeit", "hobby", "hobbies", "was machst du gern", "what do you like to do"]),
+    ("history", ["geschichte", "history", "histor", "einstein", "vereinigten königreich", "uk", "british"]),
+    ("science", ["wissenschaft", "science", "physik", "physic", "biologie", "biology", "chemie", "chemistry"]),
+    ("practice", ["üben", "practice", "lernen", "learn", "deutsch", "german"]),
+    ("meaning", ["was bedeutet", "what does", "meaning", "bedeutung"]),
+    ("time", ["wie spät"]),
+    ("origin", ["woher komm"]),
+    ("age", ["wie alt"]),
+    ("home", ["wo wohn"]),
+    ("doing", ["was machst"]),
+    ("happy", ["glücklich", "happy", "freude", "freut mich"]),
+    ("sad", ["traurig", "sad", "schlecht", "müde", "tired"]),
+    ("hungry", ["hungrig", "hungry", "durstig", "thirsty"]),
+    ("how_to_say", ["wie sagt man", "how do you say"]),
+    ("german_is_hard", ["deutsch ist schwer"]),
+    ("easy", ["leicht", "easy", "einfach"]),
+    ("why", ["warum", "why", "wieso"]),
+    ("when", ["wann", "when"]),
+    ("where", ["wo", "where"]),
+    ("how", ["wie", "how"]),
+]
+
+
+def legacy_intent(user_input):
+    user_input_lower = user_input.lower()
+    for name, words in LEGACY_CHAIN:
+        if any(word in user_input_lower for word in words):
+            return name
+    return None
+
+
+WORDS = ("ich du er sie es wir haus auto essen trinken schule arbeit stadt zug wetter sonne regen "
+         "buch lesen schreiben spielen gehen kommen sehen morgen abend heute gestern bitte "
+         "the a house car school work city train weather book read write play go come see").split()
+PHRASES = ["wie geht es dir", "was machst du gern", "wo wohnst du", "wie alt bist du", "danke schön",
+           "ich bin müde", "deutsch ist schwer", "what does this mean", "tschüss", "warum"]
+
+
+def synthetic_messages(n, seed=0):
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(n):
+        words = rng.choices(WORDS, k=rng.randint(2, 14))
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(PHRASES))
+        messages.append(" ".join(words).capitalize() + rng.choice(["", "?", "!", "."]))
+    return messages
+
+
+def bench(fn, messages, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for msg in messages:
+            fn(msg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    messages = synthetic_messages(args.messages)
+    matcher = IntentMatcher.from_file()
+
+    def compiled_intent(msg):
+        intent = matcher.match(msg)
+        return intent["name"] if intent else None
+
+    for label, fn in (("legacy if/elif chain", legacy_intent), ("compiled matcher", compiled_intent)):
+        seconds = bench(fn, messages)
+        print(f"{label:22s} {len(messages) / seconds:>12,.0f} msg/s  {seconds / len(messages) * 1e6:7.2f} us/msg")
+
+    differ = sum(legacy_intent(m) != compiled_intent(m) for m in messages)
+    print(f"intent differs on {differ}/{len(messages)} messages (word-boundary matching)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Reproducible benchmarks for the app's hot paths, with saved baselines.
+
+    python benchmarks/bench_suite.py                         # run everything, print a table
+    python benchmarks/bench_suite.py --suite chatbot quiz    # a subset
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json   # exit 1 on regression
+
+Suites:
+
+* ``translate``: ``translate_text`` through the real backend chain.  The
+  remote backends point at a local stub server (stub_server.py) with
+  injected latency.  It covers local dictionary/lesson hits, cold remote
+  calls, cache hits, and a flaky primary API that makes the chain hedge and
+  fall back.
+* ``content``: parsing lessons.json/quizzes.json scaled to 10x, 100x and
+  1000x, opening the same content as a compiled pack (content_pack.py),
+  building the lesson phrase index, and vocabulary search queries.
+* ``chatbot``: ``get_german_response`` over a synthetic message corpus.
+* ``quiz``: grading generated quizzes and generating them.
+
+Each benchmark reports p50/p95/p99 latency per operation, throughput and
+the peak traced memory.  Baselines depend on the machine; save one per
+machine and compare on the same one.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import harness  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+SUITES = ("translate", "content", "chatbot", "quiz")
+SCALES = (10, 100, 1000)
+
+
+# ---------- translate ----------
+def bench_translate(args, results):
+    from translator import LOCAL_DICT, translate_text   # imported after the environment is set up
+
+    stub = args.stub
+    rng = random.Random(args.seed)
+    nonce = rng.randrange(1 << 30)          # cache dir is fresh, but keep phrases unique per run anyway
+    n = args.translations
+
+    def unique(tag, count):
+        return [f"{tag} phrase {nonce} {i} for the benchmark" for i in range(count)]
+
+    lessons = json.loads((ROOT / "lessons.json").read_text(encoding="utf-8"))
+    local = list(LOCAL_DICT) + [item["en"] for lesson in lessons for item in lesson.get("content", ())]
+    results["translate_local"] = harness.measure(
+        translate_text, [rng.choice(local) for _ in range(n * 10)], warmup=50)
+
+    stub.configure(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4, fail_rate=0.0)
+    remote = unique("remote", n)
+    results["translate_remote_cold"] = harness.measure(
+        translate_text, remote, memory_inputs=unique("remote-mem", n // 4))
+    results["translate_remote_cached"] = harness.measure(translate_text, remote * 5)
+
+    stub.configure("mymemory", fail_rate=args.fail_rate)
+    results["translate_remote_flaky"] = harness.measure(
+        translate_text, unique("flaky", n), memory_inputs=())
+    stub.configure(fail_rate=0.0)
+
+
+# ---------- content ----------
+def scaled_content(directory, factor):
+    """Write lessons/quizzes ``factor`` times the shipped size; returns the two paths."""
+    lessons = json.loads((ROOT / "lessons.json").read_text(encoding="utf-8"))
+    quizzes = json.loads((ROOT / "quizzes.json").read_text(encoding="utf-8"))["quizzes"]
+    lesson_step = max(l["lesson_id"] for l in lessons)
+    quiz_step = max(q["quiz_id"] for q in quizzes)
+    big_lessons = [dict(l, lesson_id=l["lesson_id"] + k * lesson_step, title=f"{l['title']} ({k})")
+                   for k in range(factor) for l in lessons]
+    big_quizzes = [dict(q, quiz_id=q["quiz_id"] + k * quiz_step) for k in range(factor) for q in quizzes]
+    lessons_file = Path(directory) / f"lessons_x{factor}.json"
+    quizzes_file = Path(directory) / f"quizzes_x{factor}.json"
+    lessons_file.write_text(json.dumps(big_lessons, ensure_ascii=False), encoding="utf-8")
+    quizzes_file.write_text(json.dumps({"quizzes": big_quizzes}, ensure_ascii=False), encoding="utf-8")
+    return lessons_file, quizzes_file
+
+
+def bench_content(args, results):
+    from content_pack import build_pack
+    from content_store import ContentStore
+    from phrase_index import PhraseIndex
+    from search_index import SearchIndex
+
+    with tempfile.TemporaryDirectory() as directory:
+        for factor in args.scales:
+            lessons_file, quizzes_file = scaled_content(directory, factor)
+            repeat = max(3, 300 // factor)
+            results[f"content_load_x{factor}"] = harness.measure(
+                lambda _: ContentStore(lessons_file, quizzes_file).content(), range(repeat), memory_inputs=[0])
+            content = ContentStore(lessons_file, quizzes_file).content()
+            pack_file = Path(directory) / f"content_x{factor}.pack"
+            build_pack(json.loads(lessons_file.read_text(encoding="utf-8")),
+                       json.loads(quizzes_file.read_text(encoding="utf-8"))["quizzes"], pack_file)
+            results[f"content_pack_open_x{factor}"] = harness.measure(
+                lambda _: ContentStore(lessons_file, quizzes_file, pack_file).content(), range(repeat),
+                memory_inputs=[0])
+            results[f"content_phrase_index_x{factor}"] = harness.measure(
+                lambda _: PhraseIndex.from_lessons(content.lessons), range(repeat), memory_inputs=[0])
+            index = SearchIndex.from_lessons(content.lessons)
+            words = [w for item in content.lessons[0]["content"] for w in item["de"].split()]
+            queries = [w[:k] for w in words for k in (2, 4, len(w))] + ["guten mor", "danke sch"]
+            results[f"content_search_query_x{factor}"] = harness.measure(index.search, queries * 20)
+
+
+# ---------- chatbot ----------
+def bench_chatbot(args, results):
+    from bench_chatbot import synthetic_messages
+    from chatbot import get_german_response
+
+    messages = synthetic_messages(args.messages, seed=args.seed)
+    results["chatbot_respond"] = harness.measure(get_german_response, messages, warmup=100,
+                                                 memory_inputs=messages[:2000])
+
+
+# ---------- quiz ----------
+def bench_quiz(args, results):
+    from quiz_engine import QuizBook
+    from quiz_gen import QuizGenerator
+
+    lessons = json.loads((ROOT / "lessons.json").read_text(encoding="utf-8"))
+    generator = QuizGenerator(lessons, seed=args.seed)
+    results["quiz_generate_20q"] = harness.measure(lambda _: list(generator.generate(20)), range(500))
+
+    quizzes = [{"quiz_id": qid, "title": f"Q{qid}", "questions": list(generator.generate(20))} for qid in range(200)]
+    book = QuizBook(quizzes)
+    rng = random.Random(args.seed)
+    attempts = []
+    for _ in range(5000):
+        quiz = rng.choice(quizzes)
+        answers = {i: (q["answer"] if rng.random() < 0.7 else rng.choice(q.get("options") or ["falsch"]))
+                   for i, q in enumerate(quiz["questions"])}
+        attempts.append((quiz["quiz_id"], answers))
+    results["quiz_grade_20q"] = harness.measure(lambda a: book.grade(*a), attempts, warmup=100)
+
+
+BENCHES = {"translate": bench_translate, "content": bench_content, "chatbot": bench_chatbot, "quiz": bench_quiz}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a saved baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, for a smoke run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stub API latency")
+    parser.add_argument("--fail-rate", type=float, default=0.3, help="stub failure rate in the flaky scenario")
+    args = parser.parse_args(argv)
+    args.translations = 40 if args.quick else 200
+    args.messages = 2000 if args.quick else 20000
+    args.scales = SCALES[:2] if args.quick else SCALES
+    random.seed(args.seed)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as state_dir, StubServer() as stub:
+        # Point the app at the stub and at throwaway cache/progress directories
+        # before any app module is imported
+        os.environ.update({
+            "LINGO_CACHE_DIR": state_dir,
+            "LINGO_DATA_DIR": state_dir,
+            "LINGO_MYMEMORY_URL": stub.urls["mymemory"],
+            "LINGO_LIBRETRANSLATE_URL": stub.urls["libretranslate"],
+            "LINGO_BACKENDS": "dict,lessons,mymemory,libretranslate",
+            "LINGO_HEDGE_MS": str(args.latency_ms * 3),
+            "LINGO_METRICS": "0",
+        })
+        args.stub = stub
+        for suite in args.suite:
+            print(f"running {suite}…", file=sys.stderr)
+            BENCHES[suite](args, results)
+
+    baseline = harness.load(args.compare) if args.compare else None
+    harness.print_table(results, baseline)
+    if args.save:
+        harness.save(args.save, results)
+        print(f"baseline saved to {args.save}", file=sys.stderr)
+    if baseline is not None:
+        regressions = harness.compare(results, baseline, args.tolerance)
+        for name, field, old, new in regressions:
+            print(f"REGRESSION {name} {field}: {old} -> {new}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Measurement helpers shared by the benchmark scripts.
+
+``measure`` times a callable once per input and reports latency percentiles,
+throughput and the peak memory traced while it ran.  Results are plain
+dicts, so a whole run saves to JSON.  ``compare`` checks a run against a
+saved baseline.
+"""
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+# Fields compared against the baseline; higher is worse for all of them
+COMPARED = ("p50_us", "p95_us", "peak_kb")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def summarize(latencies, elapsed, peak_bytes=0):
+    """Result dict for per-operation ``latencies`` (seconds)."""
+    values = sorted(latencies)
+    n = len(values)
+    return {
+        "n": n,
+        "p50_us": round(percentile(values, 0.50) * 1e6, 2),
+        "p95_us": round(percentile(values, 0.95) * 1e6, 2),
+        "p99_us": round(percentile(values, 0.99) * 1e6, 2),
+        "mean_us": round(sum(values) / n * 1e6, 2) if n else 0.0,
+        "ops_per_s": round(n / elapsed, 1) if elapsed else 0.0,
+        "peak_kb": round(peak_bytes / 1024, 1),
+    }
+
+
+def measure(fn, inputs, warmup=0, memory_inputs=None):
+    """Call ``fn(x)`` for each input; time every call.
+
+    Memory is traced in a separate pass over ``memory_inputs`` (default: the
+    same inputs), so tracemalloc's overhead does not distort the timings.
+    Pass fresh inputs when a second pass would only hit caches, or ``()`` to
+    skip the memory pass.
+    """
+    inputs = list(inputs)
+    for x in inputs[:warmup]:
+        fn(x)
+    gc.collect()
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for x in inputs:
+        t0 = clock()
+        fn(x)
+        latencies.append(clock() - t0)
+    elapsed = clock() - started
+    memory_inputs = inputs if memory_inputs is None else list(memory_inputs)
+
+    def memory_pass():
+        for x in memory_inputs:
+            fn(x)
+
+    peak = traced_peak(memory_pass) if memory_inputs else 0
+    return summarize(latencies, elapsed, peak)
+
+
+def traced_peak(fn):
+    """Peak bytes allocated while ``fn()`` runs."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def environment():
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine()}
+
+
+def save(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, tolerance=0.25, floor_us=5.0):
+    """Regressions as ``(benchmark, field, baseline, current)`` tuples.
+
+    A field regresses when it is more than ``tolerance`` above the baseline.
+    Latencies under ``floor_us`` are ignored, since timer noise dominates them.
+    """
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for field in COMPARED:
+            old, new = before.get(field), current.get(field)
+            if old is None or new is None:
+                continue
+            if field.endswith("_us") and max(old, new) < floor_us:
+                continue
+            if new > old * (1 + tolerance):
+                regressions.append((name, field, old, new))
+    return regressions
+
+
+def print_table(results, baseline=None, out=sys.stdout):
+    header = f"{'benchmark':32s} {'n':>7s} {'p50 us':>10s} {'p95 us':>10s} {'p99 us':>10s} {'ops/s':>11s} {'peak KB':>10s}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for name, r in results.items():
+        line = (f"{name:32s} {r['n']:>7d} {r['p50_us']:>10.1f} {r['p95_us']:>10.1f} {r['p99_us']:>10.1f} "
+                f"{r['ops_per_s']:>11,.0f} {r['peak_kb']:>10.1f}")
+        before = (baseline or {}).get(name)
+        if before and before.get("p50_us"):
+            line += f"  p50 {(r['p50_us'] / before['p50_us'] - 1) * 100:+.0f}%"
+        print(line, file=out)
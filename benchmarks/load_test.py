@@ -0,0 +1,298 @@
+"""Concurrent-session load test for main.py, built on Streamlit's AppTest.
+
+    python benchmarks/load_test.py                          # ramp 1, 10, 50, 100, 200 sessions
+    python benchmarks/load_test.py --sessions 5 20 --think-ms 100 --latency-ms 80
+    python benchmarks/load_test.py --save load.json         # same JSON format as bench_suite
+
+Each simulated learner is one AppTest session.  It walks Home → Lessons →
+Translator → Quiz → Chatbot and does a random mix of clicks on the way:
+search a word, open or complete a lesson, translate a phrase and wait for
+the result, answer and submit a quiz, and chat.  The translation APIs are
+the local stub (stub_server.py) with configurable latency.  Learners pause
+for ``--think-ms`` ± 50% between actions.
+
+AppTest sets up a process-global runtime for every run, so two runs cannot
+overlap.  Reruns are therefore serialized with a lock.  A Streamlit server
+behaves much the same under the GIL: the app keeps network waits off the
+script thread (translations run on a pool, progress writes are
+write-behind), so reruns compete for the interpreter.  The latency recorded
+for a rerun is its wait for the lock plus its run time, which is what a
+learner would see.
+
+Per concurrency level the report gives rerun latency percentiles per page
+and reruns per second.  ``translate_wait`` is the time from clicking
+Translate until the result is shown.  The knee is the first level where p95
+exceeds ``--knee-factor`` times the one-session p95, or where throughput
+grows by less than 10%.  Per-session memory is measured in a separate pass
+with tracemalloc.  It is the traced growth per session while
+``--memory-sessions`` sessions are alive after one walk, and it includes
+AppTest's copy of the rendered page.
+"""
+import argparse
+import gc
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import harness  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+
+LEVELS = (1, 10, 50, 100, 200)
+PAGES = ("Home", "Lessons", "Translator", "Quiz", "Chatbot")
+LOCAL_PHRASES = ("hello", "thank you", "good morning", "please", "see you soon", "Guten Morgen", "Danke")
+CHAT_MESSAGES = ("Hallo!", "Wie geht's?", "Ich lerne Deutsch.", "Was ist das Wetter heute?", "Danke!", "Tschüss")
+WORDS = ("dan", "gut", "morgen", "hallo", "bitte", "wie", "tag")
+
+_run_lock = threading.Lock()
+
+
+class Learner:
+    """One AppTest session; ``record(name, seconds)`` receives every timed rerun."""
+
+    def __init__(self, number, rng, record, think=0.0, translate_timeout=10.0):
+        from streamlit.testing.v1 import AppTest
+
+        self.number = number
+        self.rng = rng
+        self.record = record
+        self.think = think
+        self.translate_timeout = translate_timeout
+        self.at = AppTest.from_file(str(ROOT / "main.py"), default_timeout=120)
+        self.phrases = 0
+
+    def pause(self):
+        if self.think:
+            time.sleep(self.think * self.rng.uniform(0.5, 1.5))
+
+    def rerun(self, name, action=None):
+        """Run ``action`` (a widget interaction ending in ``.run()``) or a plain rerun, timed."""
+        self.pause()
+        t0 = time.perf_counter()
+        with _run_lock:
+            (action or self.at.run)()
+        self.record(name, time.perf_counter() - t0)
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+
+    def navigate(self, page):
+        self.rerun(page, lambda: self.at.sidebar.selectbox[0].set_value(page).run())
+
+    def by_label(self, elements, label):
+        return next((e for e in elements if e.label == label), None)
+
+    # ---------- pages ----------
+    def home(self):
+        self.rerun("Home")
+
+    def lessons(self):
+        self.navigate("Lessons")
+        at, rng = self.at, self.rng
+        if rng.random() < 0.5:
+            word = rng.choice(WORDS)
+            self.rerun("Lessons", lambda: at.text_input(key="word_search").set_value(word).run())
+        select = self.by_label(at.selectbox, "Select a lesson")
+        if select is not None and len(select.options) > 1 and rng.random() < 0.7:
+            index = rng.randrange(1, len(select.options))          # 0 is "-- choose --"
+            self.rerun("Lessons", lambda: select.select_index(index).run())
+            complete = next((b for b in at.button if b.key and b.key.startswith("complete_")), None)
+            if complete is not None and rng.random() < 0.3:
+                self.rerun("Lessons", lambda: at.button(key=complete.key).click().run())
+
+    def translator(self):
+        self.navigate("Translator")
+        at, rng = self.at, self.rng
+        if rng.random() < 0.4:
+            phrase = rng.choice(LOCAL_PHRASES)
+        else:
+            self.phrases += 1
+            phrase = f"learner {self.number} sentence {self.phrases} {rng.randrange(1 << 30)}"
+        self.rerun("Translator", lambda: at.text_input(key="translator_input").set_value(phrase).run())
+        started = time.perf_counter()
+        self.rerun("Translator", lambda: self.by_label(at.button, "Translate").click().run())
+        # The page polls in a fragment; AppTest does not run timers, so poll with reruns
+        while at.session_state["translation_future"] is not None:
+            if time.perf_counter() - started > self.translate_timeout:
+                raise RuntimeError("Translator: no result within the timeout")
+            time.sleep(0.05)
+            self.rerun("Translator")
+        self.record("translate_wait", time.perf_counter() - started)
+
+    def quiz(self):
+        self.navigate("Quiz")
+        at, rng = self.at, self.rng
+        if rng.random() < 0.5:
+            self.rerun("Quiz", lambda: self.by_label(at.radio, "Quiz source").set_value("Generate from a lesson").run())
+        questions = [r for r in at.radio if r.key and r.key.startswith("q")]
+        for radio in rng.sample(questions, min(len(questions), rng.randint(1, 4))):
+            key, option = radio.key, rng.choice(radio.options)
+            self.rerun("Quiz", lambda: at.radio(key=key).set_value(option).run())
+        submit = next((b for b in at.button if b.key and b.key.startswith("submit_")), None)
+        if submit is not None and rng.random() < 0.5:
+            self.rerun("Quiz", lambda: at.button(key=submit.key).click().run())
+
+    def chatbot(self):
+        self.navigate("Chatbot")
+        at, rng = self.at, self.rng
+        for _ in range(rng.randint(1, 3)):
+            message = rng.choice(CHAT_MESSAGES)
+
+            def send():
+                at.text_input[0].set_value(message)
+                self.by_label(at.button, "Send").click().run()
+            self.rerun("Chatbot", send)
+        if rng.random() < 0.3:
+            self.rerun("Chatbot", lambda: self.by_label(at.button, "Hallo! Wie geht's?").click().run())
+
+    def walk(self):
+        self.home()
+        self.lessons()
+        self.translator()
+        self.quiz()
+        self.chatbot()
+
+
+def run_level(sessions, args):
+    """Run ``sessions`` concurrent learners; returns (latencies by name, elapsed, errors)."""
+    latencies = defaultdict(list)
+    lock = threading.Lock()
+    errors = []
+
+    def record(name, seconds):
+        with lock:
+            latencies[name].append(seconds)
+
+    def learner(number):
+        rng = random.Random(args.seed * 100_003 + sessions * 1009 + number)
+        try:
+            time.sleep(rng.uniform(0, args.think))          # stagger the arrivals
+            person = Learner(number, rng, record, think=args.think)
+            for _ in range(args.walks):
+                person.walk()
+        except Exception as e:
+            with lock:
+                errors.append(f"learner {number}: {e!r}")
+
+    threads = [threading.Thread(target=learner, args=(n,), name=f"learner-{n}") for n in range(sessions)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - started, errors
+
+
+def session_memory(count, args):
+    """Traced bytes per session while ``count`` sessions that each did one walk are alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        alive = []
+        for n in range(count):
+            person = Learner(n, random.Random(args.seed + n), lambda name, seconds: None)
+            person.walk()
+            alive.append(person)
+        gc.collect()
+        return (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+
+def find_knee(levels, knee_factor):
+    """First level whose p95 or throughput shows degradation, with the reason; None if none does."""
+    if not levels:
+        return None
+    base_p95 = levels[0]["p95_us"]
+    previous = None
+    for level in levels:
+        if base_p95 and level["p95_us"] > knee_factor * base_p95:
+            return level["sessions"], f"p95 {level['p95_us'] / 1000:.0f} ms > {knee_factor:g}x the 1-level p95"
+        if previous and level["ops_per_s"] < previous["ops_per_s"] * 1.10:
+            return level["sessions"], (f"throughput {level['ops_per_s']:.0f} reruns/s, "
+                                       f"< 10% above {previous['ops_per_s']:.0f} at {previous['sessions']} sessions")
+        previous = level
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=list(LEVELS), help="concurrency levels to run")
+    parser.add_argument("--walks", type=int, default=1, help="full page walks per learner")
+    parser.add_argument("--think-ms", type=float, default=300.0, help="mean pause between actions")
+    parser.add_argument("--latency-ms", type=float, default=60.0, help="stub API latency")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="stub API failure rate")
+    parser.add_argument("--memory-sessions", type=int, default=10, help="sessions in the memory pass (0 = skip)")
+    parser.add_argument("--knee-factor", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", metavar="PATH", help="write the results as JSON")
+    args = parser.parse_args(argv)
+    args.think = args.think_ms / 1000
+
+    results = {}
+    levels = []
+    with tempfile.TemporaryDirectory() as state_dir, StubServer() as stub:
+        # Point the app at the stub and at throwaway cache/progress directories
+        # before any app module is imported
+        os.environ.update({
+            "LINGO_CACHE_DIR": state_dir,
+            "LINGO_DATA_DIR": state_dir,
+            "LINGO_MYMEMORY_URL": stub.urls["mymemory"],
+            "LINGO_LIBRETRANSLATE_URL": stub.urls["libretranslate"],
+            "LINGO_BACKENDS": "dict,lessons,mymemory,libretranslate",
+            "LINGO_HEDGE_MS": str(args.latency_ms * 3),
+            "LINGO_METRICS": "0",
+        })
+        stub.configure(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4, fail_rate=args.fail_rate)
+
+        # One untimed walk first, so imports and content loading are not charged to the first level
+        Learner(0, random.Random(args.seed), lambda name, seconds: None).walk()
+        for sessions in args.sessions:
+            print(f"running {sessions} sessions…", file=sys.stderr)
+            latencies, elapsed, errors = run_level(sessions, args)
+            for error in errors[:5]:
+                print(f"  {error}", file=sys.stderr)
+            reruns = [s for name, values in latencies.items() if name != "translate_wait" for s in values]
+            overall = harness.summarize(reruns, elapsed)
+            overall.update(sessions=sessions, errors=len(errors),
+                           max_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+            levels.append(overall)
+            results[f"load_{sessions}_all"] = overall
+            for name in PAGES + ("translate_wait",):
+                if latencies.get(name):
+                    results[f"load_{sessions}_{name}"] = harness.summarize(latencies[name], elapsed)
+
+        memory = session_memory(args.memory_sessions, args) if args.memory_sessions else None
+
+    harness.print_table(results)
+    print()
+    for level in levels:
+        print(f"{level['sessions']:>5d} sessions: {level['ops_per_s']:>7.1f} reruns/s, "
+              f"p95 {level['p95_us'] / 1000:>8.1f} ms, max RSS {level['max_rss_kb'] / 1024:.0f} MB, "
+              f"{level['errors']} errors")
+    knee = find_knee(levels, args.knee_factor)
+    if knee:
+        print(f"latency degrades at {knee[0]} sessions ({knee[1]})")
+    else:
+        print("no degradation up to the highest level run")
+    if memory is not None:
+        print(f"memory per session: {memory / 1024:.0f} KB (traced, {args.memory_sessions} sessions)")
+        results["load_session_memory"] = {"bytes": round(memory)}
+    if args.save:
+        harness.save(args.save, results)
+        print(f"results saved to {args.save}", file=sys.stderr)
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
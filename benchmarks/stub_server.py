@@ -0,0 +1,137 @@
+"""Local stand-in for the MyMemory and LibreTranslate APIs.
+
+    python benchmarks/stub_server.py --port 8765 --latency-ms 40 --jitter-ms 10 --fail-rate 0.1
+
+Point the app at it with
+``LINGO_MYMEMORY_URL=http://127.0.0.1:8765/get`` and
+``LINGO_LIBRETRANSLATE_URL=http://127.0.0.1:8765/translate``.  Each endpoint
+answers with the input prefixed by ``MM:`` or ``LT:``.  It sleeps
+``latency ± jitter`` first and fails with HTTP 500 at ``fail_rate``.  The
+settings are per endpoint and can be changed while the server runs
+(``StubServer.configure``).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ENDPOINTS = ("mymemory", "libretranslate")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"        # keep-alive, like the real APIs
+    disable_nagle_algorithm = True       # headers and body go out in separate writes
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, endpoint, make_body):
+        stub = self.server.stub
+        settings = stub.settings[endpoint]
+        with stub.lock:
+            stub.requests[endpoint] += 1
+        delay = settings["latency"] + random.uniform(-settings["jitter"], settings["jitter"])
+        if delay > 0:
+            time.sleep(delay)
+        if random.random() < settings["fail_rate"]:
+            with stub.lock:
+                stub.failures[endpoint] += 1
+            body, status = b'{"error": "injected failure"}', 500
+        else:
+            body, status = json.dumps(make_body()).encode("utf-8"), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/get":
+            self.send_error(404)
+            return
+        text = parse_qs(url.query).get("q", [""])[0]
+        self._reply("mymemory", lambda: {"responseData": {"translatedText": "MM:" + text}, "responseStatus": 200})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/translate":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"{}")
+        self._reply("libretranslate", lambda: {"translatedText": "LT:" + data.get("q", "")})
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024            # the default backlog of 5 stalls concurrent clients
+
+
+class StubServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.lock = threading.Lock()
+        self.settings = {name: {"latency": 0.0, "jitter": 0.0, "fail_rate": 0.0} for name in ENDPOINTS}
+        self.requests = dict.fromkeys(ENDPOINTS, 0)
+        self.failures = dict.fromkeys(ENDPOINTS, 0)
+        self._server = _Server((host, port), _Handler)
+        self._server.stub = self
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+    @property
+    def urls(self):
+        base = f"http://{self.host}:{self.port}"
+        return {"mymemory": f"{base}/get", "libretranslate": f"{base}/translate"}
+
+    def configure(self, endpoint=None, latency_ms=None, jitter_ms=None, fail_rate=None):
+        """Change latency/failure injection for one endpoint, or all when ``endpoint`` is None."""
+        for name in ([endpoint] if endpoint else ENDPOINTS):
+            settings = self.settings[name]
+            if latency_ms is not None:
+                settings["latency"] = latency_ms / 1000
+            if jitter_ms is not None:
+                settings["jitter"] = jitter_ms / 1000
+            if fail_rate is not None:
+                settings["fail_rate"] = fail_rate
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve stand-in translation APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    stub = StubServer(args.host, args.port)
+    stub.configure(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, fail_rate=args.fail_rate)
+    for name, url in stub.urls.items():
+        print(f"{name}: {url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
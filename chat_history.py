@@ -0,0 +1,142 @@
+"""Chat transcript with a bounded in-memory tail and an on-disk archive.
+
+``ChatHistory`` keeps the newest ``cap`` messages in a deque.  A message
+pushed out of the deque is appended to a JSONL archive file under
+``CACHE_DIR/chat``.  Session memory therefore stays bounded however long
+the conversation runs.  ``window(count)`` returns the newest ``count``
+messages.  Those come from memory unless ``count`` exceeds the cap, in which
+case the older part is read from the archive.  The archive keeps the byte
+offset of every line, so reading one page seeks once.
+
+Archive files belong to one session.  ``clear`` deletes the file, and files
+left behind by sessions that ended are pruned after ``ARCHIVE_MAX_AGE``.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+
+from translation_cache import CACHE_DIR
+
+ARCHIVE_DIR = CACHE_DIR / "chat"
+ARCHIVE_MAX_AGE = 7 * 24 * 3600          # seconds
+MEMORY_MESSAGES = int(os.environ.get("LINGO_CHAT_MEMORY", "200"))
+
+_pruned = False
+_prune_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Message:
+    role: str                            # "user" or "bot"
+    text: str
+    at: float = field(default_factory=time.time)
+
+
+def prune_archives(max_age=ARCHIVE_MAX_AGE, now=None):
+    """Delete archive files not written for ``max_age`` seconds."""
+    now = time.time() if now is None else now
+    try:
+        entries = list(os.scandir(ARCHIVE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.name.endswith(".jsonl") and now - entry.stat().st_mtime > max_age:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+class ChatArchive:
+    """Append-only JSONL file of messages with random access by position."""
+
+    def __init__(self, path=None):
+        global _pruned
+        with _prune_lock:
+            if not _pruned:
+                _pruned = True
+                prune_archives()
+        self.path = path or ARCHIVE_DIR / f"{uuid.uuid4().hex}.jsonl"
+        self.offsets = array("Q", [0])   # line i spans offsets[i]:offsets[i + 1]
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def extend(self, messages):
+        lines = b"".join(
+            json.dumps([m.role, m.text, m.at], ensure_ascii=False).encode("utf-8") + b"\n" for m in messages)
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(lines)
+        for line in lines.splitlines(keepends=True):
+            self.offsets.append(self.offsets[-1] + len(line))
+
+    def read(self, start, stop):
+        """Messages ``start`` to ``stop - 1`` (oldest first)."""
+        start, stop = max(start, 0), min(stop, len(self))
+        if start >= stop:
+            return []
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offsets[start])
+                data = f.read(self.offsets[stop] - self.offsets[start])
+        except OSError:                  # pruned or removed under us
+            return []
+        return [Message(*json.loads(line)) for line in data.splitlines()]
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.offsets = array("Q", [0])
+
+
+class ChatHistory:
+    def __init__(self, cap=MEMORY_MESSAGES, archive=None):
+        self.cap = cap
+        self.recent = deque()
+        self._archive = archive          # created on the first overflow
+
+    def __len__(self):
+        return len(self.recent) + (len(self._archive) if self._archive else 0)
+
+    @property
+    def archived(self):
+        return len(self._archive) if self._archive else 0
+
+    def extend(self, messages):
+        self.recent.extend(messages)
+        if len(self.recent) > self.cap:
+            overflow = [self.recent.popleft() for _ in range(len(self.recent) - self.cap)]
+            if self._archive is None:
+                self._archive = ChatArchive()
+            self._archive.extend(overflow)
+
+    def append(self, role, text):
+        self.extend([Message(role, text)])
+
+    def add_turn(self, user_text, bot_text):
+        now = time.time()
+        self.extend([Message("user", user_text, now), Message("bot", bot_text, now)])
+
+    def window(self, count):
+        """The newest ``count`` messages, oldest first."""
+        if count <= len(self.recent):
+            return list(islice(self.recent, len(self.recent) - max(count, 0), None))
+        older = self._archive.read(self.archived - (count - len(self.recent)), self.archived) if self._archive else []
+        return older + list(self.recent)
+
+    def clear(self):
+        self.recent.clear()
+        if self._archive is not None:
+            self._archive.delete()
+            self._archive = None
@@ -0,0 +1,125 @@
+"""Rule-based German chatbot driven by chatbot_intents.json.
+
+All intent keywords are compiled once into a word-level trie (an Aho-Corasick
+style automaton over tokens).  The message is tokenized once, and each token
+position walks the trie.  The result is the highest-priority intent, i.e. the
+one listed first in the file.  Matching is on whole words, so "wo" no longer
+fires inside "wort".  A trailing ``*`` on a keyword's last word allows any
+ending ("wie geht*" matches "wie gehts").
+"""
+import json
+import random
+import re
+import threading
+from pathlib import Path
+
+import metrics
+from request_log import LOGGED_TEXT, log_request
+
+INTENTS_FILE = Path(__file__).parent / "chatbot_intents.json"
+INTENT_HITS = metrics.Counter("lingo_chatbot_intent_total", "Chatbot replies by matched intent", ("intent",))
+
+
+_WORD = re.compile(r"\w+")
+
+
+class _Node:
+    __slots__ = ("exact", "prefix", "stem_lengths", "intent")
+
+    def __init__(self):
+        self.exact = {}          # token -> _Node
+        self.prefix = {}         # stem -> _Node, for "stem*" tokens
+        self.stem_lengths = ()   # distinct stem lengths, longest first
+        self.intent = None       # best (lowest) intent index ending here
+
+
+class IntentMatcher:
+    def __init__(self, intents, fallback=None):
+        self.intents = list(intents)
+        self.fallback = fallback or {}
+        self.root = _Node()
+        for i, intent in enumerate(self.intents):
+            for keyword in intent["keywords"]:
+                self._add(keyword, i)
+
+    def _add(self, keyword, index):
+        keyword = keyword.lower()
+        prefix = keyword.endswith("*")
+        tokens = _WORD.findall(keyword)
+        node = self.root
+        for pos, token in enumerate(tokens):
+            if prefix and pos == len(tokens) - 1:
+                child = node.prefix.setdefault(token, _Node())
+                node.stem_lengths = tuple(sorted({len(stem) for stem in node.prefix}, reverse=True))
+            else:
+                child = node.exact.setdefault(token, _Node())
+            node = child
+        if node.intent is None or index < node.intent:
+            node.intent = index
+
+    @classmethod
+    def from_file(cls, path=INTENTS_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["intents"], data.get("fallback"))
+
+    def match(self, text: str):
+        """The highest-priority intent found in ``text``, or ``None``.
+
+        One left-to-right pass: ``active`` holds the trie nodes of keywords
+        that are partially matched up to the current token.
+        """
+        root = self.root
+        best = None
+        active = []
+        for token in _WORD.findall(text.lower()):
+            reached = []
+            for node in (*active, root):
+                child = node.exact.get(token)
+                if child is not None:
+                    reached.append(child)
+                for length in node.stem_lengths:
+                    if length > len(token):
+                        continue
+                    child = node.prefix.get(token[:length])
+                    if child is not None:
+                        reached.append(child)
+            active = []
+            for node in reached:
+                if node.intent is not None and (best is None or node.intent < best):
+                    best = node.intent
+                if node.exact or node.prefix:
+                    active.append(node)
+            if best == 0:
+                break
+        return self.intents[best] if best is not None else None
+
+    def fallback_response(self, text: str) -> str:
+        word_count = len(text.split())
+        bucket = "short" if word_count <= 2 else "medium" if word_count <= 5 else "long"
+        return random.choice(self.fallback.get(bucket) or ["..."])
+
+    def respond(self, text: str) -> str:
+        intent = self.match(text)
+        name = intent["name"] if intent is not None else "fallback"
+        INTENT_HITS.inc(name)
+        log_request("chat", text=text[:LOGGED_TEXT], intent=name)
+        return intent["response"] if intent is not None else self.fallback_response(text)
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> IntentMatcher:
+    """Matcher compiled once per process from INTENTS_FILE."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = IntentMatcher.from_file()
+    return _matcher
+
+
+def get_german_response(user_input: str) -> str:
+    return get_matcher().respond(user_input)
@@ -0,0 +1,321 @@
+"""Compiled, memory-mapped form of lessons.json + quizzes.json.
+
+    python content_pack.py                      # lessons.json + quizzes.json -> content.pack
+    python content_pack.py --lessons big.json --quizzes q.json --out big.pack
+
+JSON stays the authoring format.  The pack is a build artifact for large
+catalogs.  Every string is stored once in a string table.  Lessons and
+items are parallel integer arrays that point into it.  The file is opened
+with ``mmap``, so all worker processes share one read-only copy through the
+page cache.  Nothing is decoded until a lesson is accessed.  Lesson titles
+and item counts are read straight from the arrays, so list views never
+decode lesson content.  Decoded lessons are cached in two segments:
+a lesson enters a small probation segment and moves to the main one when it
+is read again.  A full scan therefore only cycles the probation segment and
+does not evict the lessons in regular use.
+
+Layout (little-endian)::
+
+    header    b"LGPK", u32 format version, u32 section count,
+              then (u64 offset, u64 count) per section in SECTIONS order
+    sections  8-byte aligned typed arrays, see SECTIONS
+
+``str_offsets`` has ``n_strings + 1`` entries and string ``i`` is
+``str_blob[str_offsets[i]:str_offsets[i + 1]]``.  ``lesson_first`` works the
+same way for each lesson's range of items, and ``item_first`` for each
+item's range of text fields.  A text field is a ``field_keys``/
+``field_values`` pair of string ids, e.g. ``"fr"`` -> ``"Merci"``, so items
+can carry any set of languages.  Lesson keys other than
+``lesson_id``/``title``/``content`` and item values that are not strings are
+kept as a JSON string in the ``*_extra`` arrays.  Quizzes are small and
+irregular, so each one is stored as a JSON string.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from types import MappingProxyType
+
+from content_store import freeze
+
+MAGIC = b"LGPK"
+FORMAT_VERSION = 2
+NONE = 0xFFFFFFFF                 # string id for "no value"
+DECODED_CACHE = 4096              # decoded lessons/quizzes kept per pack
+PROBATION = DECODED_CACHE // 4    # of which seen only once
+
+# (name, array typecode) in file order
+SECTIONS = (
+    ("str_offsets", "Q"),
+    ("lesson_ids", "i"),
+    ("lesson_titles", "I"),
+    ("lesson_first", "I"),
+    ("lesson_extra", "I"),
+    ("item_first", "I"),
+    ("item_extra", "I"),
+    ("field_keys", "I"),
+    ("field_values", "I"),
+    ("quiz_ids", "i"),
+    ("quiz_json", "I"),
+    ("str_blob", "B"),
+)
+_HEADER = struct.Struct("<4sII")
+_SECTION = struct.Struct("<QQ")
+
+
+class PackError(Exception):
+    """The file is not a content pack this version can read."""
+
+
+# ---------- build ----------
+class _Strings:
+    def __init__(self):
+        self.ids = {}
+        self.blob = bytearray()
+        self.offsets = array("Q", [0])
+
+    def add(self, value):
+        if value is None:
+            return NONE
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.offsets) - 1
+            self.blob += value.encode("utf-8")
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def _extra(mapping, known):
+    rest = {k: v for k, v in mapping.items() if k not in known}
+    return json.dumps(rest, ensure_ascii=False, sort_keys=True, separators=(",", ":")) if rest else None
+
+
+def build_pack(lessons, quizzes, out_path):
+    """Write ``lessons``/``quizzes`` (JSON-shaped lists) to ``out_path`` atomically."""
+    strings = _Strings()
+    arrays = {name: array(code) for name, code in SECTIONS if name not in ("str_offsets", "str_blob")}
+    arrays["lesson_first"].append(0)
+    arrays["item_first"].append(0)
+    for lesson in lessons:
+        arrays["lesson_ids"].append(lesson["lesson_id"])
+        arrays["lesson_titles"].append(strings.add(lesson.get("title")))
+        arrays["lesson_extra"].append(strings.add(_extra(lesson, ("lesson_id", "title", "content"))))
+        for item in lesson.get("content", ()):
+            text_keys = [k for k, v in item.items() if isinstance(v, str)]
+            for key in text_keys:
+                arrays["field_keys"].append(strings.add(key))
+                arrays["field_values"].append(strings.add(item[key]))
+            arrays["item_first"].append(len(arrays["field_keys"]))
+            arrays["item_extra"].append(strings.add(_extra(item, text_keys)))
+        arrays["lesson_first"].append(len(arrays["item_extra"]))
+    for quiz in quizzes:
+        arrays["quiz_ids"].append(quiz["quiz_id"])
+        arrays["quiz_json"].append(strings.add(json.dumps(quiz, ensure_ascii=False, separators=(",", ":"))))
+    arrays["str_offsets"] = strings.offsets
+    arrays["str_blob"] = array("B", strings.blob)
+
+    payloads = []
+    for name, _ in SECTIONS:
+        data = arrays[name]
+        if sys.byteorder != "little":
+            data = array(data.typecode, data)
+            data.byteswap()
+        payloads.append((data.tobytes(), len(arrays[name])))
+
+    offset = _HEADER.size + _SECTION.size * len(SECTIONS)
+    table = []
+    for raw, count in payloads:
+        offset = (offset + 7) & ~7
+        table.append((offset, count))
+        offset += len(raw)
+
+    out_path = Path(out_path)
+    tmp = out_path.with_name(out_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(SECTIONS)))
+        for section_offset, count in table:
+            f.write(_SECTION.pack(section_offset, count))
+        for (section_offset, _), (raw, _) in zip(table, payloads):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(raw)
+    # Readers that still have the old file mapped keep their copy
+    os.replace(tmp, out_path)
+
+
+# ---------- read ----------
+class _Decoded(Sequence):
+    """Read-only sequence that decodes element ``i`` on access and keeps the ones read repeatedly."""
+
+    def __init__(self, count, decode):
+        self._count = count
+        self._decode = decode
+        self._probation = OrderedDict()  # read once, oldest first
+        self._protected = OrderedDict()  # read again while on probation, least recent first
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(self._count)))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        with self._lock:
+            value = self._protected.get(index)
+            if value is not None:
+                self._protected.move_to_end(index)
+                return value
+            value = self._probation.pop(index, None)
+            if value is not None:
+                self._protected[index] = value
+                if len(self._protected) > DECODED_CACHE - PROBATION:
+                    self._protected.popitem(last=False)
+                return value
+        value = self._decode(index)
+        with self._lock:
+            self._probation[index] = value
+            if len(self._probation) > PROBATION:
+                self._probation.popitem(last=False)
+        return value
+
+
+class _StringColumn(Sequence):
+    """Column of string ids read from the string table on access, uncached."""
+
+    def __init__(self, pack, string_ids):
+        self._pack = pack
+        self._ids = string_ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        return self._pack.string(self._ids[index])
+
+
+class _ById(Mapping):
+    """``id -> element`` over a ``_Decoded`` sequence, decoding on access."""
+
+    def __init__(self, ids, elements):
+        self.ids = ids
+        self.position = MappingProxyType({element_id: i for i, element_id in enumerate(ids)})
+        self._elements = elements
+
+    def __getitem__(self, element_id):
+        return self._elements[self.position[element_id]]
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, element_id):
+        return element_id in self.position
+
+
+class ContentPack:
+    """A mapped pack file; ``lessons``/``quizzes`` decode lazily."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        if sys.byteorder != "little":
+            raise PackError("content packs are little-endian and are mapped as-is")
+        with open(self.path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:            # empty file
+                raise PackError(f"{self.path}: {e}") from e
+        view = memoryview(self._map)
+        magic, version, n_sections = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or n_sections != len(SECTIONS):
+            raise PackError(f"{self.path}: not a version {FORMAT_VERSION} content pack")
+        self._arrays = {}
+        for i, (name, code) in enumerate(SECTIONS):
+            offset, count = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            size = struct.calcsize(code)
+            self._arrays[name] = view[offset:offset + count * size].cast(code)
+        a = self._arrays
+        self._offsets, self._blob = a["str_offsets"], a["str_blob"]
+
+        self.lesson_ids = tuple(a["lesson_ids"])
+        self.lesson_titles = _StringColumn(self, a["lesson_titles"])
+        first = a["lesson_first"]
+        self.item_counts = tuple(first[i + 1] - first[i] for i in range(len(self.lesson_ids)))
+        self.quiz_ids = tuple(a["quiz_ids"])
+        self.lessons = _Decoded(len(self.lesson_ids), self._lesson)
+        self.quizzes = _Decoded(len(self.quiz_ids), self._quiz)
+        self.lesson_by_id = _ById(self.lesson_ids, self.lessons)
+        self.quiz_by_id = _ById(self.quiz_ids, self.quizzes)
+
+    def string(self, string_id):
+        if string_id == NONE:
+            return None
+        return str(self._blob[self._offsets[string_id]:self._offsets[string_id + 1]], "utf-8")
+
+    def _with_extra(self, fields, extra_id):
+        extra = self.string(extra_id)
+        if extra:
+            fields.update(json.loads(extra))
+        return fields
+
+    def _item(self, n):
+        a = self._arrays
+        keys, values = a["field_keys"], a["field_values"]
+        fields = {self.string(keys[f]): self.string(values[f])
+                  for f in range(a["item_first"][n], a["item_first"][n + 1])}
+        return MappingProxyType(self._with_extra(fields, a["item_extra"][n]))
+
+    def _lesson(self, i):
+        a = self._arrays
+        first, end = a["lesson_first"][i], a["lesson_first"][i + 1]
+        fields = self._with_extra({
+            "lesson_id": a["lesson_ids"][i],
+            "title": self.string(a["lesson_titles"][i]),
+        }, a["lesson_extra"][i])
+        fields = {k: freeze(v) for k, v in fields.items()}
+        fields["content"] = tuple(self._item(n) for n in range(first, end))
+        return MappingProxyType(fields)
+
+    def _quiz(self, i):
+        return freeze(json.loads(self.string(self._arrays["quiz_json"][i])))
+
+
+def main(argv=None):
+    from content_store import LESSONS_FILE, PACK_FILE, QUIZZES_FILE
+
+    parser = argparse.ArgumentParser(description="Compile lessons/quizzes JSON into a content pack.")
+    parser.add_argument("--lessons", default=str(LESSONS_FILE))
+    parser.add_argument("--quizzes", default=str(QUIZZES_FILE))
+    parser.add_argument("--out", default=str(PACK_FILE))
+    args = parser.parse_args(argv)
+
+    with open(args.lessons, "r", encoding="utf-8") as f:
+        lessons = json.load(f)
+    quizzes = []
+    if os.path.exists(args.quizzes):
+        with open(args.quizzes, "r", encoding="utf-8") as f:
+            quizzes = json.load(f)
+        if isinstance(quizzes, dict):
+            quizzes = quizzes.get("quizzes", [])
+    build_pack(lessons, quizzes, args.out)
+    pack = ContentPack(args.out)
+    print(f"{args.out}: {len(pack.lessons)} lessons, {len(pack._arrays['item_extra'])} items, "
+          f"{len(pack.quizzes)} quizzes, {os.path.getsize(args.out):,} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Process-wide, load-once store for lessons.json and quizzes.json.
+
+``get_store().content()`` returns an immutable ``Content`` snapshot that is
+shared by every session.  The files are re-parsed only when their mtime (or
+size) changes.  Indexes built from the content (phrase index, search index,
+...) hang off the snapshot via ``Content.derived`` so they are rebuilt with it.
+
+If a compiled ``content.pack`` (see content_pack.py) is at least as new as
+both JSON files, it is memory-mapped instead and lessons are decoded on
+access.  Editing the JSON makes it newer than the pack, and the store goes
+back to JSON until the pack is rebuilt.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from types import MappingProxyType
+
+DATA_DIR = Path(__file__).parent
+LESSONS_FILE = DATA_DIR / "lessons.json"
+QUIZZES_FILE = DATA_DIR / "quizzes.json"
+PACK_FILE = DATA_DIR / "content.pack"
+
+
+def freeze(value):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class Content:
+    """One immutable version of the lesson and quiz catalog."""
+
+    def __init__(self, lessons, quizzes, version):
+        self.version = version
+        self.lessons = tuple(freeze(l) for l in lessons)
+        self.quizzes = tuple(freeze(q) for q in quizzes)
+        self.lesson_by_id = MappingProxyType({l["lesson_id"]: l for l in self.lessons})
+        self.quiz_by_id = MappingProxyType({q["quiz_id"]: q for q in self.quizzes})
+        self.lesson_ids = tuple(l["lesson_id"] for l in self.lessons)
+        self.lesson_titles = tuple(l.get("title") for l in self.lessons)
+        self.item_counts = tuple(len(l.get("content", ())) for l in self.lessons)
+        self.lesson_position = MappingProxyType({lid: i for i, lid in enumerate(self.lesson_ids)})
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    @classmethod
+    def from_pack(cls, pack, version):
+        """Snapshot over a ``ContentPack``; lessons and quizzes stay encoded until used."""
+        content = cls.__new__(cls)
+        content.version = version
+        content.lessons = pack.lessons
+        content.quizzes = pack.quizzes
+        content.lesson_by_id = pack.lesson_by_id
+        content.quiz_by_id = pack.quiz_by_id
+        content.lesson_ids = pack.lesson_ids
+        content.lesson_titles = pack.lesson_titles
+        content.item_counts = pack.item_counts
+        content.lesson_position = pack.lesson_by_id.position
+        content._derived = {}
+        content._derived_lock = threading.Lock()
+        return content
+
+    def title(self, lesson_id):
+        """A lesson's title without decoding the lesson."""
+        return self.lesson_titles[self.lesson_position[lesson_id]]
+
+    def derived(self, name, build):
+        """``build(self)`` computed once per content version and cached under ``name``."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ContentStore:
+    def __init__(self, lessons_file=LESSONS_FILE, quizzes_file=QUIZZES_FILE, pack_file=None):
+        self.lessons_file = Path(lessons_file)
+        self.quizzes_file = Path(quizzes_file)
+        self.pack_file = Path(pack_file) if pack_file else None
+        self._content = None
+        self._lock = threading.Lock()
+
+    def _version(self):
+        lessons, quizzes = _stamp(self.lessons_file), _stamp(self.quizzes_file)
+        pack = _stamp(self.pack_file) if self.pack_file else None
+        if pack is not None and all(s is None or pack[0] >= s[0] for s in (lessons, quizzes)):
+            return (lessons, quizzes, pack)
+        return (lessons, quizzes, None)
+
+    def _load(self, version):
+        if version[2] is not None:
+            from content_pack import ContentPack, PackError   # only needed when a pack exists
+            try:
+                return Content.from_pack(ContentPack(self.pack_file), version)
+            except (OSError, PackError):
+                pass                     # unreadable pack: fall back to the JSON
+        lessons = _read_json(self.lessons_file, [])
+        quizzes = _read_json(self.quizzes_file, {"quizzes": []})
+        if isinstance(quizzes, dict):
+            quizzes = quizzes.get("quizzes", [])
+        return Content(lessons, quizzes, version)
+
+    def content(self) -> Content:
+        """Current snapshot; re-parses the files only if they changed on disk."""
+        version = self._version()
+        current = self._content
+        if current is not None and current.version == version:
+            return current
+        with self._lock:
+            if self._content is None or self._content.version != version:
+                self._content = self._load(version)
+            return self._content
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> ContentStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ContentStore(pack_file=PACK_FILE)
+    return _store
@@ -0,0 +1,56 @@
+"""Language codes and multi-language lesson items.
+
+A lesson item maps language codes to text, for any set of languages:
+
+    {"en": "Thank you", "de": "Danke", "fr": "Merci"}
+
+The app has no fixed language pair.  A session picks the language it
+speaks (native) and the one it learns.  Keys that are not language codes
+(e.g. ``"note"``) are ignored here.  English is the pivot for translation
+between two languages that no backend pairs directly.
+"""
+import re
+
+LANGUAGE_NAMES = {
+    "en": "English", "de": "German", "fr": "French", "es": "Spanish", "it": "Italian",
+    "pt": "Portuguese", "nl": "Dutch", "pl": "Polish", "sv": "Swedish", "tr": "Turkish",
+    "ru": "Russian", "uk": "Ukrainian", "ar": "Arabic", "ja": "Japanese", "zh": "Chinese",
+}
+PIVOT = "en"
+DEFAULT_PAIR = ("en", "de")      # (native, learning)
+
+_CODE = re.compile(r"[a-z]{2,3}(-[A-Za-z0-9]{2,8})?\Z")
+
+
+def is_language_code(key) -> bool:
+    return isinstance(key, str) and _CODE.match(key) is not None
+
+
+def language_name(code: str) -> str:
+    return LANGUAGE_NAMES.get(code, code)
+
+
+def item_languages(item):
+    """Language codes that have text in ``item``."""
+    return [key for key, value in item.items() if is_language_code(key) and isinstance(value, str) and value]
+
+
+def content_languages(content):
+    """Every language used by any lesson item, sorted; cached per content version."""
+    def build(c):
+        found = set()
+        for lesson in c.lessons:
+            for item in lesson.get("content", ()):
+                found.update(item_languages(item))
+        return tuple(sorted(found))
+    return content.derived("languages", build)
+
+
+def default_source(target: str) -> str:
+    """Source language assumed when a caller gives only the target."""
+    return DEFAULT_PAIR[1] if target == DEFAULT_PAIR[0] else DEFAULT_PAIR[0]
+
+
+def pair_text(item, native, learning, missing="—"):
+    """``(native text, learning text)`` of an item, with ``missing`` for absent languages."""
+    return item.get(native) or missing, item.get(learning) or missing
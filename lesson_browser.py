@@ -0,0 +1,50 @@
+"""Filtering and pagination for the Lessons page.
+
+Only the lessons on the visible page are rendered, so widget count stays
+constant however large the catalog grows.
+"""
+import math
+
+from languages import item_languages
+
+STATUS_OPTIONS = ("All", "Not completed", "Completed")
+PAGE_SIZES = (10, 25, 50)
+
+
+def lesson_label(content, lesson_id) -> str:
+    return f"Lesson {lesson_id}: {content.title(lesson_id)}"
+
+
+def _search_texts(content):
+    # lesson_id -> lowercase haystack of title and every item text
+    return {
+        l["lesson_id"]: " ".join(
+            [l["title"]] + [item[lang] for item in l.get("content", ()) for lang in item_languages(item)]
+        ).casefold()
+        for l in content.lessons
+    }
+
+
+def filter_lessons(content, query="", status="All", completed=frozenset()):
+    """Lesson ids matching ``query`` (substring of title/items) and ``status``."""
+    ids = content.lesson_ids
+    query = query.strip().casefold()
+    if query:
+        texts = content.derived("lesson_search_texts", _search_texts)
+        ids = [lid for lid in ids if query in texts[lid]]
+    if status == "Completed":
+        ids = [lid for lid in ids if lid in completed]
+    elif status == "Not completed":
+        ids = [lid for lid in ids if lid not in completed]
+    return ids
+
+
+def page_count(n_items: int, page_size: int) -> int:
+    return max(1, math.ceil(n_items / page_size))
+
+
+def page_slice(items, page: int, page_size: int):
+    """Items on 1-based ``page`` (clamped to the valid range)."""
+    page = min(max(1, page), page_count(len(items), page_size))
+    start = (page - 1) * page_size
+    return items[start:start + page_size]
@@ -0,0 +1,115 @@
+"""Translate-as-you-type for the Translator page.
+
+One ``LiveTranslation`` lives in each session.  ``update`` records the
+latest input.  ``poll`` submits work only once the input has been stable for
+``debounce`` seconds.  The text is split into sentences and each sentence is
+translated on its own:
+
+* sentences translated before come from a per-session memo, so editing one
+  sentence re-translates just that sentence;
+* new sentences go through ``async_translate.submit``, which shares in-flight
+  requests across sessions and sits on top of the translation cache;
+* pending sentences that are no longer in the text are released, and
+  ``async_translate`` cancels them if nobody else is waiting.
+
+``generation`` increases with every edit, so the page can tell whether a
+rendition is for the text currently in the box.
+"""
+import time
+from collections import OrderedDict
+from concurrent.futures import CancelledError
+
+import async_translate
+from segmenter import split_segments
+from translator import FAILED_MESSAGE
+
+DEBOUNCE = 0.6                   # seconds of quiet before translating
+MEMO_SIZE = 256                  # translated sentences remembered per session
+PENDING_MARK = "…"
+
+
+class LiveTranslation:
+    def __init__(self, debounce=DEBOUNCE, memo_size=MEMO_SIZE):
+        self.debounce = debounce
+        self.memo_size = memo_size
+        self.text = ""
+        self.target = None
+        self.source = None
+        self.changed_at = 0.0
+        self.generation = 0
+        self.memo = OrderedDict()    # (sentence, source, target) -> translation, None if it failed
+        self.pending = {}            # (sentence, source, target) -> Future
+        self.rendered = ""           # latest rendition
+        self.rendered_generation = 0
+
+    def update(self, text, target, now=None, source=None) -> bool:
+        """Record the current input; True if it changed."""
+        if text == self.text and target == self.target and source == self.source:
+            return False
+        self.text, self.target, self.source = text, target, source
+        self.changed_at = time.monotonic() if now is None else now
+        self.generation += 1
+        # Failed sentences get another try after an edit
+        for key in [key for key, value in self.memo.items() if value is None]:
+            del self.memo[key]
+        return True
+
+    def settled(self, now=None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now - self.changed_at >= self.debounce
+
+    def finished(self) -> bool:
+        """True once the rendition covers the current text completely."""
+        return self.rendered_generation == self.generation and not self.pending
+
+    def poll(self, now=None) -> bool:
+        """Advance the translation; True when ``rendered`` is final for the current text."""
+        if not self.settled(now):
+            return False
+        source, target = self.source, self.target
+        pairs = split_segments(self.text)
+        wanted = {(segment.strip(), source, target) for segment, _ in pairs if segment.strip()}
+
+        # Stale requests: sentences edited away or a different direction
+        for key in [key for key in self.pending if key not in wanted]:
+            async_translate.release(self.pending.pop(key), key[0], key[2], key[1])
+
+        parts = []
+        for segment, sep in pairs:
+            sentence = segment.strip()
+            if not sentence:
+                parts.append(segment + sep)
+                continue
+            key = (sentence, source, target)
+            if key not in self.memo:
+                fut = self.pending.get(key)
+                if fut is None:
+                    fut = self.pending[key] = async_translate.submit(sentence, target, source)
+                if not fut.done():
+                    parts.append(PENDING_MARK + sep)
+                    continue
+                del self.pending[key]
+                try:
+                    result = fut.result()
+                except CancelledError:   # released by everyone sharing it; not remembered
+                    parts.append(segment + sep)
+                    continue
+                self._remember(key, None if result == FAILED_MESSAGE else result)
+            self.memo.move_to_end(key)
+            # Keep the original for sentences that could not be translated
+            parts.append((self.memo[key] or sentence) + sep)
+
+        self.rendered = "".join(parts).strip()
+        self.rendered_generation = self.generation
+        return not self.pending
+
+    def _remember(self, key, value):
+        self.memo[key] = value
+        while len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+
+    def cancel(self):
+        """Release everything still pending (e.g. live mode switched off)."""
+        for (sentence, source, target), fut in self.pending.items():
+            async_translate.release(fut, sentence, target, source)
+        self.pending.clear()
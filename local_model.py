@@ -0,0 +1,137 @@
+"""Offline translation with MarianMT models.
+
+EN<->DE is configured by default.  More directions are listed in
+``LINGO_MODEL_PAIRS`` (e.g. ``en-fr,fr-en``) and use the
+``Helsinki-NLP/opus-mt-{source}-{target}`` checkpoints.
+
+transformers/torch are imported only when the first request for a direction
+arrives, and each model is loaded once per process.  Requests from all
+sessions go through one worker thread per direction. The worker waits a few
+milliseconds to collect concurrent requests, then runs them through a single
+batched forward pass on the CPU.
+"""
+import functools
+import importlib.util
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+MODELS = {
+    ("en", "de"): os.environ.get("LINGO_MODEL_EN_DE", "Helsinki-NLP/opus-mt-en-de"),
+    ("de", "en"): os.environ.get("LINGO_MODEL_DE_EN", "Helsinki-NLP/opus-mt-de-en"),
+}
+MODEL_TEMPLATE = "Helsinki-NLP/opus-mt-{source}-{target}"
+for _pair in filter(None, (p.strip() for p in os.environ.get("LINGO_MODEL_PAIRS", "").split(","))):
+    _source, _, _target = _pair.partition("-")
+    MODELS.setdefault((_source, _target), MODEL_TEMPLATE.format(source=_source, target=_target))
+MAX_BATCH = int(os.environ.get("LINGO_MODEL_MAX_BATCH", "16"))
+BATCH_WAIT = float(os.environ.get("LINGO_MODEL_BATCH_WAIT_MS", "10")) / 1000
+NUM_THREADS = int(os.environ.get("LINGO_TORCH_THREADS", str(min(4, os.cpu_count() or 1))))
+REQUEST_TIMEOUT = 30
+
+
+@functools.lru_cache(maxsize=None)
+def _installed() -> bool:
+    # find_spec walks sys.path (~50 µs); supports() runs for every translation
+    return (importlib.util.find_spec("transformers") is not None
+            and importlib.util.find_spec("torch") is not None)
+
+
+def is_enabled() -> bool:
+    """True when the local engine is switched on and its dependencies are installed."""
+    if os.environ.get("LINGO_LOCAL_MODEL", "1").lower() in ("0", "false", "no", "off"):
+        return False
+    return _installed()
+
+
+class _Worker:
+    """Owns one model and batches requests for it on a background thread."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.requests = queue.Queue()
+        self.ready = threading.Event()
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name=f"marian-{model_name}", daemon=True)
+        self.thread.start()
+
+    def _load(self):
+        import torch
+        from transformers import MarianMTModel, MarianTokenizer
+
+        torch.set_num_threads(NUM_THREADS)
+        self.torch = torch
+        self.tokenizer = MarianTokenizer.from_pretrained(self.model_name)
+        self.model = MarianMTModel.from_pretrained(self.model_name).eval()
+
+    def _run(self):
+        try:
+            self._load()
+        except Exception as e:          # missing weights offline, broken install, ...
+            self.error = e
+        self.ready.set()
+        while True:
+            batch = [self.requests.get()]
+            # Small wait window so requests from concurrent sessions share a pass.
+            try:
+                while len(batch) < MAX_BATCH:
+                    batch.append(self.requests.get(timeout=BATCH_WAIT))
+            except queue.Empty:
+                pass
+            self._translate_batch(batch)
+
+    def _translate_batch(self, batch):
+        if self.error is not None:
+            for _, fut in batch:
+                fut.set_exception(self.error)
+            return
+        texts = [text for text, _ in batch]
+        try:
+            with self.torch.inference_mode():
+                encoded = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+                generated = self.model.generate(**encoded, num_beams=1, max_new_tokens=256)
+            outputs = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        for (_, fut), out in zip(batch, outputs):
+            fut.set_result(out)
+
+    def submit(self, text) -> Future:
+        fut = Future()
+        self.requests.put((text, fut))
+        return fut
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def _get_worker(source, target):
+    key = (source, target)
+    if key not in MODELS:
+        return None
+    with _workers_lock:
+        worker = _workers.get(key)
+        if worker is None:
+            worker = _workers[key] = _Worker(MODELS[key])
+    return worker
+
+
+def supports(source: str, target: str) -> bool:
+    return (source, target) in MODELS and is_enabled()
+
+
+def translate(text: str, source: str, target: str, timeout: float = REQUEST_TIMEOUT):
+    """Translate ``text`` locally. Returns ``None`` if the engine is unavailable."""
+    if not supports(source, target):
+        return None
+    worker = _get_worker(source, target)
+    if worker.error is not None:
+        return None
+    try:
+        return worker.submit(text).result(timeout=timeout) or None
+    except Exception:
+        return None
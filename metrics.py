@@ -0,0 +1,227 @@
+"""Counters, histograms and timers for the hot paths, exported as Prometheus text.
+
+Metrics are declared once at module level next to the code they measure:
+
+    BACKEND_SECONDS = metrics.Histogram("lingo_backend_seconds", "Backend call time", ("backend",))
+    with BACKEND_SECONDS.time(backend.name):
+        ...
+
+Collection is off unless ``LINGO_METRICS=1``.  While it is off, ``inc``,
+``observe`` and ``time`` return after a single global check, so the
+instrumentation can stay in place.  When it is on, ``start_from_env`` also
+exports the metrics:
+
+* ``LINGO_METRICS_PORT``: serve ``/metrics`` over HTTP on 127.0.0.1 (or
+  ``LINGO_METRICS_HOST``);
+* ``LINGO_METRICS_FILE``: rewrite this file every ``DUMP_INTERVAL`` seconds
+  and at exit (e.g. for node_exporter's textfile collector).
+"""
+import atexit
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("LINGO_METRICS", "0") == "1"
+DUMP_INTERVAL = 15.0             # seconds
+# Seconds; covers in-memory lookups (~µs) up to remote timeouts
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REGISTRY = {}                    # name -> metric
+_registry_lock = threading.Lock()
+
+
+def enable(on=True):
+    """Switch collection on or off at runtime (benchmarks, ad-hoc profiling)."""
+    global ENABLED
+    ENABLED = on
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self.values = {}             # label values tuple -> value
+        self._lock = threading.Lock()
+        with _registry_lock:
+            REGISTRY[name] = self
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self.values.items())
+            lines.extend(self._samples(items))
+        return lines
+
+    def _samples(self, items):
+        for labels, value in items:
+            yield f"{self.name}{_label_text(self.labelnames, labels)} {value}"
+
+    def reset(self):
+        with self._lock:
+            self.values.clear()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        if not ENABLED:
+            return
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, *labels):
+        return self.values.get(labels, 0)
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        if not ENABLED:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self.values.get(labels)
+            if state is None:
+                # per-bucket counts (last one is +Inf), then sum
+                state = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def time(self, *labels):
+        """Context manager observing the elapsed seconds of its block."""
+        if not ENABLED:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def count(self, *labels):
+        state = self.values.get(labels)
+        return sum(state[:-1]) if state else 0
+
+    def _samples(self, items):
+        for labels, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), state[:-1]):
+                cumulative += count
+                le = (("le", bound),)
+                yield f"{self.name}_bucket{_label_text(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_label_text(self.labelnames, labels)} {state[-1]}"
+            yield f"{self.name}_count{_label_text(self.labelnames, labels)} {cumulative}"
+
+
+# ---------- export ----------
+def render_text() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(REGISTRY.values())
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def dump(path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_text())
+    os.replace(tmp, path)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_from_env():
+    """Start the exporters configured in the environment, once per process."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        port = os.environ.get("LINGO_METRICS_PORT")
+        if port:
+            try:
+                serve(int(port), os.environ.get("LINGO_METRICS_HOST", "127.0.0.1"))
+            except OSError:
+                pass             # another process of this app already serves the port
+        path = os.environ.get("LINGO_METRICS_FILE")
+        if path:
+            def dump_loop():
+                while True:
+                    time.sleep(DUMP_INTERVAL)
+                    dump(path)
+            threading.Thread(target=dump_loop, name="metrics-dump", daemon=True).start()
+            atexit.register(dump, path)
@@ -0,0 +1,139 @@
+"""Bidirectional phrase index over language pairs with trigram fuzzy lookup.
+
+Keys are normalized for case, punctuation, whitespace and typographic
+apostrophes, so "How’s it going?" and "how's it going" hit the same entry.
+Fuzzy lookup shortlists candidates through a trigram inverted index and then
+confirms them with a bounded edit distance.
+"""
+import heapq
+import unicodedata
+from collections import defaultdict
+
+from languages import item_languages
+
+_QUOTES = str.maketrans({"’": "'", "‘": "'", "`": "'", "´": "'", "ʼ": "'", "“": '"', "”": '"', "„": '"'})
+
+MIN_FUZZY_LENGTH = 4
+MIN_DICE = 0.6
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).translate(_QUOTES).casefold()
+    kept = []
+    for ch in text:
+        if ch == "'" or not unicodedata.category(ch).startswith("P"):
+            kept.append(ch)
+        else:
+            kept.append(" ")
+    return " ".join("".join(kept).split()).strip("'")
+
+
+def trigrams(key: str):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up (returning limit + 1) once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+class PhraseIndex:
+    def __init__(self, fuzzy=True):
+        self.fuzzy = fuzzy
+        self._exact = defaultdict(dict)                           # (src, tgt) -> {key: translation}
+        self._grams = defaultdict(lambda: defaultdict(list))      # (src, tgt) -> {gram: [key, ...]}
+        self._gram_counts = defaultdict(dict)                     # (src, tgt) -> {key: n trigrams}
+
+    @classmethod
+    def from_pairs(cls, pairs, source="en", target="de", fuzzy=True):
+        index = cls(fuzzy=fuzzy)
+        for a, b in pairs:
+            index.add(a, b, source, target)
+        return index
+
+    @classmethod
+    def from_lessons(cls, lessons, fuzzy=True, languages=None):
+        """Index lesson items for the ``languages`` pair, or for every pair an item has."""
+        index = cls(fuzzy=fuzzy)
+        for lesson in lessons:
+            for item in lesson.get("content", []):
+                langs = languages or item_languages(item)
+                for i, a in enumerate(langs):
+                    for b in langs[i + 1:]:
+                        if item.get(a) and item.get(b):
+                            index.add(item[a], item[b], a, b)
+        return index
+
+    def add(self, a: str, b: str, source="en", target="de"):
+        """Register ``a`` (in ``source``) <-> ``b`` (in ``target``); first entry wins."""
+        self._add_one(a, b, (source, target))
+        self._add_one(b, a, (target, source))
+
+    def _add_one(self, text, translation, pair):
+        key = normalize(text)
+        if not key or key in self._exact[pair]:
+            return
+        self._exact[pair][key] = translation
+        if self.fuzzy:
+            key_grams = trigrams(key)
+            self._gram_counts[pair][key] = len(key_grams)
+            grams = self._grams[pair]
+            for gram in key_grams:
+                grams[gram].append(key)
+
+    def supports(self, source, target) -> bool:
+        return (source, target) in self._exact
+
+    def __len__(self):
+        return sum(len(table) for table in self._exact.values())
+
+    def lookup(self, text: str, source: str, target: str, fuzzy=None):
+        """Translation of ``text`` or ``None``; tries an exact match before fuzzy."""
+        table = self._exact.get((source, target))
+        if not table:
+            return None
+        key = normalize(text)
+        hit = table.get(key)
+        if hit is not None:
+            return hit
+        if fuzzy is None:
+            fuzzy = self.fuzzy
+        if not fuzzy or len(key) < MIN_FUZZY_LENGTH:
+            return None
+        best = self._closest(key, (source, target))
+        return table[best] if best is not None else None
+
+    def _closest(self, key, pair):
+        grams = self._grams.get(pair)
+        if not grams:
+            return None
+        query = trigrams(key)
+        shared = defaultdict(int)
+        for gram in query:
+            for candidate in grams.get(gram, ()):
+                shared[candidate] += 1
+        sizes = self._gram_counts[pair]
+        n = len(query)
+        shortlist = heapq.nlargest(
+            8, ((2 * count / (sizes[c] + n), c) for c, count in shared.items())
+        )
+        limit = max(1, len(key) // 6)
+        best, best_dist = None, limit + 1
+        for dice, candidate in shortlist:
+            if dice < MIN_DICE:
+                break
+            dist = edit_distance(key, candidate, limit)
+            if dist < best_dist:
+                best, best_dist = candidate, dist
+        return best
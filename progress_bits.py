@@ -0,0 +1,206 @@
+"""Completed lessons as a bitset over dense lesson positions.
+
+``ProgressBits`` is a set of lesson ids.  Bit ``i`` of a packed bytearray
+stands for ``lesson_ids[i]``, in catalog order (see ``Content.lesson_position``),
+so ten thousand lessons take 1.25 KB.  Membership, ``add`` and ``discard``
+are a dict lookup plus one byte operation.  ``len`` and the completion ratio
+come from a counter that every change keeps up to date.  Bulk changes are
+whole-bitset operations on one int, which CPython runs a machine word at a
+time: mark all, reset, and union/intersection/difference with another
+``ProgressBits`` for the same catalog.
+
+Ids that are not in the catalog are ignored.  When the content changes,
+``rebase`` maps the set onto the new catalog by id.
+
+``encode_ids``/``decode_ids`` are the compact export encoding: the sorted
+ids as deltas, each a LEB128 varint, in base64.  Consecutive ids take one
+byte each before base64.  Only non-negative integer ids can be encoded
+(``encodable``); anything else (string ids from a legacy or hand-edited file)
+has to be stored separately.
+"""
+import base64
+import binascii
+from collections.abc import MutableSet
+
+ENCODING = "delta-varint-base64"
+
+
+class ProgressBits(MutableSet):
+    def __init__(self, lesson_ids, completed=(), position=None):
+        self.ids = tuple(lesson_ids)
+        self.position = position if position is not None else {lid: i for i, lid in enumerate(self.ids)}
+        self.flags = bytearray((len(self.ids) + 7) // 8)
+        self.count = 0
+        self.ignored = 0                 # ids seen by the last bulk update that are not in the catalog
+        self.update(completed)
+
+    @classmethod
+    def for_content(cls, content, completed=()):
+        return cls(content.lesson_ids, completed, content.lesson_position)
+
+    def rebase(self, content):
+        """The same completed ids over ``content``'s catalog (``self`` if it is unchanged)."""
+        if content.lesson_ids is self.ids:
+            return self
+        return ProgressBits.for_content(content, self)
+
+    # ---------- whole-set helpers ----------
+    def _as_int(self):
+        return int.from_bytes(self.flags, "little")
+
+    def _set_int(self, bits):
+        self.flags[:] = bits.to_bytes(len(self.flags), "little")
+        self.count = bits.bit_count()
+
+    def _mask(self, lesson_ids):
+        """Bits of ``lesson_ids`` as an int; counts ids outside the catalog in ``ignored``."""
+        if isinstance(lesson_ids, ProgressBits) and lesson_ids.ids is self.ids:
+            self.ignored = 0
+            return lesson_ids._as_int()
+        if lesson_ids is self.ids:
+            self.ignored = 0
+            return (1 << len(self.ids)) - 1
+        flags = bytearray(len(self.flags))
+        position = self.position
+        ignored = 0
+        for lid in lesson_ids:
+            i = position.get(lid)
+            if i is None:
+                ignored += 1
+            else:
+                flags[i >> 3] |= 1 << (i & 7)
+        self.ignored = ignored
+        return int.from_bytes(flags, "little")
+
+    def _from_iterable(self, lesson_ids):
+        # Results of the Set mixin operators stay bitsets over this catalog
+        return ProgressBits(self.ids, lesson_ids, self.position)
+
+    # ---------- set protocol ----------
+    def __contains__(self, lesson_id):
+        i = self.position.get(lesson_id)
+        return i is not None and self.flags[i >> 3] >> (i & 7) & 1 == 1
+
+    def __iter__(self):
+        """Completed ids in catalog order."""
+        ids = self.ids
+        for byte_index, byte in enumerate(self.flags):
+            while byte:
+                low = byte & -byte
+                yield ids[byte_index * 8 + low.bit_length() - 1]
+                byte ^= low
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"ProgressBits({self.count}/{len(self.ids)})"
+
+    def add(self, lesson_id):
+        i = self.position.get(lesson_id)
+        if i is not None and not self.flags[i >> 3] >> (i & 7) & 1:
+            self.flags[i >> 3] |= 1 << (i & 7)
+            self.count += 1
+
+    def discard(self, lesson_id):
+        i = self.position.get(lesson_id)
+        if i is not None and self.flags[i >> 3] >> (i & 7) & 1:
+            self.flags[i >> 3] &= ~(1 << (i & 7))
+            self.count -= 1
+
+    def update(self, lesson_ids):
+        self._set_int(self._as_int() | self._mask(lesson_ids))
+
+    def difference_update(self, lesson_ids):
+        self._set_int(self._as_int() & ~self._mask(lesson_ids))
+
+    def clear(self):
+        self.flags[:] = bytes(len(self.flags))
+        self.count = 0
+
+    def fill(self):
+        """Mark every lesson completed."""
+        self._set_int((1 << len(self.ids)) - 1)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __or__(self, other):
+        result = self.copy()
+        result.update(other)
+        return result
+
+    __ror__ = __or__
+
+    def __and__(self, other):
+        result = self.copy()
+        result._set_int(self._as_int() & result._mask(other))
+        return result
+
+    __rand__ = __and__
+
+    def __sub__(self, other):
+        result = self.copy()
+        result.difference_update(other)
+        return result
+
+    def copy(self):
+        result = ProgressBits(self.ids, (), self.position)
+        result.flags[:] = self.flags
+        result.count = self.count
+        return result
+
+    # ---------- aggregates ----------
+    @property
+    def total(self):
+        return len(self.ids)
+
+    @property
+    def ratio(self):
+        return self.count / len(self.ids) if self.ids else 0.0
+
+
+# ---------- compact encoding ----------
+def encodable(lesson_id) -> bool:
+    return isinstance(lesson_id, int) and not isinstance(lesson_id, bool) and lesson_id >= 0
+
+
+def encode_ids(lesson_ids) -> str:
+    """Sorted, de-duplicated non-negative ids as base64 delta varints; ValueError names any other id."""
+    lesson_ids = set(lesson_ids)
+    for lid in lesson_ids:
+        if not encodable(lid):
+            raise ValueError(f"lesson id {lid!r} is not a non-negative integer")
+    out = bytearray()
+    previous = 0
+    for lid in sorted(lesson_ids):
+        delta, previous = lid - previous, lid
+        while delta >= 0x80:
+            out.append(delta & 0x7F | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return base64.b64encode(out).decode("ascii")
+
+
+def decode_ids(text: str):
+    """Yield the ids of an ``encode_ids`` string; ValueError if it is malformed."""
+    try:
+        data = base64.b64decode(text, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"not base64: {e}") from e
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        yield previous
+        value = shift = 0
+    if shift:
+        raise ValueError("truncated varint")
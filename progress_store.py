@@ -0,0 +1,219 @@
+"""Server-side learner progress in an embedded SQLite database (WAL mode).
+
+Reads (``load_user``) are synchronous.  Writes are queued and applied by a
+background thread in batched transactions, so a button click only pays for
+a ``queue.put``.  ``flush()`` waits for everything queued so far to be on
+disk; it is called before loading a user and at interpreter exit.
+
+A batch that fails because the database is locked or busy is retried a few
+times.  A batch that fails otherwise, or is still locked after the retries,
+is applied one statement at a time, so one bad write does not take other
+users' writes with it.  Statements that still fail are logged and dropped.
+"""
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DATA_DIR = Path(os.environ.get("LINGO_DATA_DIR", Path(__file__).parent / ".data"))
+DB_FILE = DATA_DIR / "progress.sqlite3"
+
+FLUSH_INTERVAL = 0.25        # seconds a batch may wait for more writes
+MAX_BATCH = 500
+WRITE_ATTEMPTS = 4
+RETRY_DELAY = 0.5            # seconds before the first retry, doubled after each
+
+log = logging.getLogger("lingo.progress")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completed (
+    user_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    completed_at REAL NOT NULL,
+    PRIMARY KEY (user_id, lesson_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quiz_scores (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    quiz_id INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    taken_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quiz_scores_user ON quiz_scores (user_id, taken_at);
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS chat_messages_user ON chat_messages (user_id, id);
+CREATE TABLE IF NOT EXISTS srs_cards (
+    user_id INTEGER NOT NULL,
+    lesson_id INTEGER NOT NULL,
+    item_index INTEGER NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (user_id, lesson_id, item_index)
+) WITHOUT ROWID;
+"""
+
+
+def _is_busy(error):
+    name = getattr(error, "sqlite_errorname", "")
+    return name.startswith(("SQLITE_BUSY", "SQLITE_LOCKED")) or (
+        not name and ("database is locked" in str(error) or "busy" in str(error)))
+
+
+def _connect(path):
+    db = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class ProgressStore:
+    def __init__(self, path=DB_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._read_db = _connect(self.path)
+        self._read_db.executescript(SCHEMA)
+        self._read_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    # ---------- write-behind ----------
+    def _write_loop(self):
+        db = _connect(self.path)
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < MAX_BATCH:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            waiters = [op for op in batch if isinstance(op, threading.Event)]
+            self._apply(db, [op for op in batch if not isinstance(op, threading.Event)])
+            for event in waiters:
+                event.set()
+
+    def _apply(self, db, ops):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                with db:                     # one transaction per batch
+                    for op in ops:
+                        db.execute(*op)
+                return
+            except sqlite3.Error as e:
+                if not _is_busy(e) or attempt + 1 == WRITE_ATTEMPTS:
+                    log.warning("progress batch of %d writes failed (%s); applying them one by one", len(ops), e)
+                    break
+                time.sleep(RETRY_DELAY * 2 ** attempt)
+        for op in ops:
+            try:
+                with db:
+                    db.execute(*op)
+            except sqlite3.Error as e:
+                log.error("dropped progress write %r %r: %s", op[0], op[1], e)
+
+    def _enqueue(self, sql, params=()):
+        self._queue.put((sql, params))
+
+    def flush(self, timeout=5.0) -> bool:
+        """Block until every write queued before this call is committed."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    # ---------- users ----------
+    def get_or_create_user(self, username: str) -> int:
+        username = username.strip()
+        with self._read_lock, self._read_db as db:
+            db.execute("INSERT OR IGNORE INTO users (username, created_at) VALUES (?, ?)",
+                       (username, time.time()))
+            return db.execute("SELECT user_id FROM users WHERE username = ?", (username,)).fetchone()[0]
+
+    def load_user(self, user_id: int) -> dict:
+        """Everything a session needs at start: completed ids, quiz scores, chat, review cards."""
+        self.flush()
+        with self._read_lock:
+            db = self._read_db
+            completed = {row[0] for row in db.execute(
+                "SELECT lesson_id FROM completed WHERE user_id = ?", (user_id,))}
+            scores = db.execute(
+                "SELECT quiz_id, score, total, taken_at FROM quiz_scores WHERE user_id = ? ORDER BY taken_at",
+                (user_id,)).fetchall()
+            chat = db.execute(
+                "SELECT role, text FROM chat_messages WHERE user_id = ? ORDER BY id", (user_id,)).fetchall()
+            cards = db.execute(
+                "SELECT lesson_id, item_index, ease, interval, reps, lapses, due FROM srs_cards WHERE user_id = ?",
+                (user_id,)).fetchall()
+        return {
+            "completed": completed,
+            "quiz_scores": [dict(zip(("quiz_id", "score", "total", "taken_at"), row)) for row in scores],
+            "chat": chat,
+            "cards": cards,
+        }
+
+    # ---------- progress ----------
+    def mark_completed(self, user_id: int, lesson_ids):
+        now = time.time()
+        for lesson_id in lesson_ids:
+            self._enqueue("INSERT OR IGNORE INTO completed VALUES (?, ?, ?)", (user_id, lesson_id, now))
+
+    def reset_completed(self, user_id: int):
+        self._enqueue("DELETE FROM completed WHERE user_id = ?", (user_id,))
+
+    def replace_completed(self, user_id: int, lesson_ids):
+        self.reset_completed(user_id)
+        self.mark_completed(user_id, lesson_ids)
+
+    def record_quiz_score(self, user_id: int, quiz_id: int, score: int, total: int):
+        self._enqueue("INSERT INTO quiz_scores (user_id, quiz_id, score, total, taken_at) VALUES (?, ?, ?, ?, ?)",
+                      (user_id, quiz_id, score, total, time.time()))
+
+    # ---------- spaced repetition ----------
+    def save_cards(self, user_id: int, rows):
+        """Upsert ``(lesson_id, item_index, ease, interval, reps, lapses, due)`` rows."""
+        for row in rows:
+            self._enqueue("INSERT OR REPLACE INTO srs_cards VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (user_id, *row))
+
+    # ---------- chat ----------
+    def append_chat(self, user_id: int, role: str, text: str):
+        self._enqueue("INSERT INTO chat_messages (user_id, role, text, created_at) VALUES (?, ?, ?, ?)",
+                      (user_id, role, text, time.time()))
+
+    def clear_chat(self, user_id: int):
+        self._enqueue("DELETE FROM chat_messages WHERE user_id = ?", (user_id,))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_progress_store() -> ProgressStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProgressStore()
+                atexit.register(_store.flush)
+    return _store
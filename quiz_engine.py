@@ -0,0 +1,78 @@
+"""Quiz grading and per-session quiz state.
+
+``QuizBook`` is built once per content version.  It indexes quizzes by id and
+precomputes the set of accepted (normalized) answers for every question, so
+grading a quiz of n questions is n set lookups.  ``QuizSession`` lives in
+``st.session_state`` and keeps the learner's answers, per-question timings
+and the graded result across reruns.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from phrase_index import normalize
+
+
+def accepted_answers(question) -> frozenset:
+    answer = question["answer"]
+    answers = answer if isinstance(answer, (list, tuple)) else (answer,)
+    return frozenset(normalize(a) for a in answers)
+
+
+class QuizBook:
+    def __init__(self, quizzes):
+        self.by_id = {q["quiz_id"]: q for q in quizzes}
+        self.ids = tuple(self.by_id)
+        self.answer_sets = {
+            qid: tuple(accepted_answers(question) for question in quiz["questions"])
+            for qid, quiz in self.by_id.items()
+        }
+
+    def grade(self, quiz_id: int, answers: dict) -> "QuizResult":
+        """Grade ``answers`` (question index -> chosen/typed answer) in one pass."""
+        answer_sets = self.answer_sets[quiz_id]
+        correct = tuple(
+            answers.get(i) is not None and normalize(answers[i]) in accepted
+            for i, accepted in enumerate(answer_sets)
+        )
+        return QuizResult(quiz_id=quiz_id, score=sum(correct), total=len(correct), correct=correct)
+
+
+@dataclass(frozen=True)
+class QuizResult:
+    quiz_id: int
+    score: int
+    total: int
+    correct: tuple
+
+    @property
+    def percent(self) -> float:
+        return 100 * self.score / self.total if self.total else 0.0
+
+
+@dataclass
+class QuizSession:
+    quiz_id: int
+    started_at: float = field(default_factory=time.monotonic)
+    last_event_at: float = field(default_factory=time.monotonic)
+    answers: dict = field(default_factory=dict)      # question index -> answer
+    seconds: dict = field(default_factory=dict)      # question index -> time spent answering
+    result: Optional[QuizResult] = None
+
+    def answer(self, index: int, value, now: float = None):
+        """Record an answer; the time since the previous answer is charged to this question."""
+        if self.result is not None:
+            return
+        now = time.monotonic() if now is None else now
+        self.seconds[index] = self.seconds.get(index, 0.0) + (now - self.last_event_at)
+        self.last_event_at = now
+        self.answers[index] = value
+
+    def submit(self, book: QuizBook) -> QuizResult:
+        if self.result is None:
+            self.result = book.grade(self.quiz_id, self.answers)
+        return self.result
+
+    @property
+    def elapsed(self) -> float:
+        return self.last_event_at - self.started_at
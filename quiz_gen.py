@@ -0,0 +1,154 @@
+"""Generate multiple-choice and fill-in questions from lesson content.
+
+Distractor pools are precomputed once per catalog.  An item's pools are the
+other answers from the same lesson, answers of similar length, and answers
+with the same first letter.  Picking a distractor is then a random index into
+a list, so generating a question costs O(1) no matter how large the corpus
+is.  Output uses the quizzes.json schema, plus ``type`` ("choice" or "fill")
+and ``item`` ([lesson_id, index]) on each question.
+
+The pools never change after construction, so one generator per catalog and
+language pair can be shared by every session.  Pass ``rng`` (or ``seed`` to
+``lesson_quiz``) per quiz; ``self.rng`` is only the default.
+
+    python quiz_gen.py --count 5000 --seed 1 --out generated_quizzes.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+from content_store import LESSONS_FILE
+from languages import DEFAULT_PAIR, LANGUAGE_NAMES
+from phrase_index import normalize
+
+LENGTH_BUCKET = 4                 # answers within 4 characters count as "similar length"
+
+
+class QuizGenerator:
+    def __init__(self, lessons, seed=None, languages=DEFAULT_PAIR):
+        self.rng = random.Random(seed)
+        self.languages = languages
+        self.items = []                                   # (lesson_id, index, {lang: text} for the pair)
+        self.by_lesson = defaultdict(list)
+        for lesson in lessons:
+            for index, item in enumerate(lesson.get("content", ())):
+                if all(item.get(lang) for lang in languages):
+                    self.by_lesson[lesson["lesson_id"]].append(len(self.items))
+                    self.items.append((lesson["lesson_id"], index, {lang: item[lang] for lang in languages}))
+        # Per answer language: pools of item numbers by length bucket and first letter
+        self.by_length = {lang: defaultdict(list) for lang in languages}
+        self.by_prefix = {lang: defaultdict(list) for lang in languages}
+        self.keys = {lang: [normalize(item[lang]) for _, _, item in self.items] for lang in languages}
+        for n, (_, _, item) in enumerate(self.items):
+            for lang in languages:
+                text = item[lang]
+                self.by_length[lang][len(text) // LENGTH_BUCKET].append(n)
+                self.by_prefix[lang][text[:1].casefold()].append(n)
+
+    def _pools(self, n, lang):
+        lesson_id, _, item = self.items[n]
+        text = item[lang]
+        return (
+            self.by_lesson[lesson_id],
+            self.by_length[lang][len(text) // LENGTH_BUCKET],
+            self.by_prefix[lang][text[:1].casefold()],
+        )
+
+    def distractors(self, n, lang, k=3, max_tries=20, rng=None):
+        """Up to ``k`` distinct wrong answers (in ``lang``) for item number ``n``."""
+        rng = rng or self.rng
+        keys = self.keys[lang]
+        seen = {keys[n]}
+        picked = []
+        pools = [p for p in self._pools(n, lang) if len(p) > 1]
+        for attempt in range(max_tries):
+            if len(picked) == k:
+                break
+            # Cycle through the pools so each contributes; fall back to the whole corpus.
+            pool = pools[attempt % len(pools)] if pools and attempt < max_tries // 2 else None
+            m = rng.choice(pool) if pool else rng.randrange(len(self.items))
+            if keys[m] not in seen:
+                seen.add(keys[m])
+                picked.append(self.items[m][2][lang])
+        return picked
+
+    def question(self, n, kind="choice", source="en", target="de", n_options=4, rng=None):
+        rng = rng or self.rng
+        lesson_id, index, item = self.items[n]
+        prompt, answer = item[source], item[target]
+        target_name = LANGUAGE_NAMES.get(target, target)
+        question = {"type": kind, "item": [lesson_id, index], "answer": answer}
+        if kind == "fill":
+            question["question"] = f"Type the {target_name} for '{prompt}':"
+            question["options"] = []
+        else:
+            options = self.distractors(n, target, n_options - 1, rng=rng) + [answer]
+            rng.shuffle(options)
+            question["question"] = f"How do you say '{prompt}' in {target_name}?"
+            question["options"] = options
+        return question
+
+    def generate(self, count, item_numbers=None, fill_ratio=0.25, reverse_ratio=0.3, rng=None):
+        """Yield ``count`` questions drawn from ``item_numbers`` (default: whole corpus)."""
+        rng = rng or self.rng
+        numbers = item_numbers if item_numbers is not None else range(len(self.items))
+        if not numbers:
+            return
+        source, target = self.languages
+        for i in range(count):
+            n = numbers[i % len(numbers)] if count <= len(numbers) else rng.choice(numbers)
+            kind = "fill" if rng.random() < fill_ratio else "choice"
+            if rng.random() < reverse_ratio:
+                yield self.question(n, kind, target, source, rng=rng)
+            else:
+                yield self.question(n, kind, source, target, rng=rng)
+
+    def lesson_quiz(self, lesson_id, title, count=10, quiz_id=None, seed=None, **kwargs):
+        """A shuffled quiz over one lesson, in the quizzes.json schema (reproducible for a ``seed``)."""
+        rng = random.Random(seed) if seed is not None else self.rng
+        numbers = list(self.by_lesson.get(lesson_id, ()))
+        rng.shuffle(numbers)
+        return {
+            "quiz_id": quiz_id if quiz_id is not None else -lesson_id,
+            "title": title,
+            "questions": list(self.generate(count, numbers, rng=rng, **kwargs)),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate quiz questions from lessons.json")
+    parser.add_argument("--lessons", default=str(LESSONS_FILE))
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--per-quiz", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fill-ratio", type=float, default=0.25)
+    parser.add_argument("--languages", nargs=2, default=list(DEFAULT_PAIR), metavar=("NATIVE", "LEARNING"),
+                        help="language pair of the questions (default: en de)")
+    parser.add_argument("--out", help="write {'quizzes': [...]} here instead of stdout")
+    args = parser.parse_args(argv)
+
+    with open(args.lessons, "r", encoding="utf-8") as f:
+        lessons = json.load(f)
+    start = time.perf_counter()
+    gen = QuizGenerator(lessons, seed=args.seed, languages=tuple(args.languages))
+    questions = list(gen.generate(args.count, fill_ratio=args.fill_ratio))
+    elapsed = time.perf_counter() - start
+    quizzes = [
+        {"quiz_id": i // args.per_quiz + 1, "title": f"Generated Quiz {i // args.per_quiz + 1}",
+         "questions": questions[i:i + args.per_quiz]}
+        for i in range(0, len(questions), args.per_quiz)
+    ]
+    out = json.dumps({"quizzes": quizzes}, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(out)
+    else:
+        print(out)
+    print(f"Generated {len(questions)} questions in {elapsed * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Append-only log of translator and chatbot requests, and cache prewarming from it.
+
+    python request_log.py top --n 500               # aggregate the log into TOP_FILE
+    python request_log.py top --n 500 --translate   # ... and translate uncached phrases now
+    python request_log.py prewarm                   # what the app does at startup
+
+``log_request`` only appends a dict to an in-memory queue.  A background
+thread wakes every ``FLUSH_INTERVAL`` seconds, or as soon as ``BATCH``
+records are waiting, and writes the queue as JSON lines to ``LOG_FILE`` in
+one ``write``.  The request path therefore never touches the disk.  When the
+queue holds ``MAX_PENDING`` records (the disk is stuck), new records are
+dropped and counted instead of blocking.
+
+Once the file passes ``LINGO_REQUEST_LOG_MAX_MB``, it is renamed and
+gzip-compressed, and only the newest ``LINGO_REQUEST_LOG_KEEP`` compressed
+files are kept.  Each flush opens the file by path, so several worker
+processes can share one log.
+
+``top`` streams every log file into approximate per-phrase counts and writes
+the most frequent translations and chat messages to ``TOP_FILE``.
+``start_from_env`` runs ``prewarm`` once per process on a background
+thread.  It copies the cached translations of the top phrases from disk into
+the memory tier and builds the lesson phrase index of every language pair
+among them.
+
+Settings: ``LINGO_REQUEST_LOG=0`` turns logging off, ``LINGO_PREWARM=0``
+turns prewarming off and ``LINGO_PREWARM_TOP`` caps the phrases prewarmed.
+"""
+import argparse
+import atexit
+import gzip
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+import metrics
+from translation_cache import CACHE_DIR, normalize_text
+
+LOGGED_TEXT = 500                # characters of each request text kept in the log
+LOG_FILE = CACHE_DIR / "request_log.jsonl"
+TOP_FILE = CACHE_DIR / "top_phrases.json"
+ENABLED = os.environ.get("LINGO_REQUEST_LOG", "1").lower() not in ("0", "false", "no", "off")
+MAX_BYTES = int(float(os.environ.get("LINGO_REQUEST_LOG_MAX_MB", "16")) * 1024 * 1024)
+KEEP = int(os.environ.get("LINGO_REQUEST_LOG_KEEP", "5"))
+PREWARM_TOP = int(os.environ.get("LINGO_PREWARM_TOP", "1000"))
+FLUSH_INTERVAL = 1.0             # seconds
+BATCH = 512                      # records that wake the writer early
+MAX_PENDING = 100_000            # records queued before new ones are dropped
+MAX_KEYS = 200_000               # distinct phrases counted by ``top`` before pruning
+
+DROPPED = metrics.Counter("lingo_request_log_dropped_total", "Request log records dropped (queue full or write failed)")
+
+
+class RequestLog:
+    def __init__(self, path=LOG_FILE, max_bytes=MAX_BYTES, keep=KEEP, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._pending = deque()
+        self._wake = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def log(self, kind, **fields):
+        """Queue one record; returns at once."""
+        pending = self._pending
+        if len(pending) >= MAX_PENDING:
+            self.dropped += 1
+            DROPPED.inc()
+            return
+        fields["kind"] = kind
+        fields["ts"] = time.time()
+        pending.append(fields)
+        if self._thread is None:
+            self._start()
+        elif len(pending) == BATCH:
+            self._wake.set()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far."""
+        with self._flush_lock:
+            batch = []
+            pending = self._pending
+            while pending:
+                batch.append(pending.popleft())
+            if not batch:
+                return
+            data = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+                           for record in batch).encode("utf-8")
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                    size = f.tell()
+            except OSError:
+                self.dropped += len(batch)
+                DROPPED.inc(amount=len(batch))
+                return
+            self.written += len(batch)
+            if size >= self.max_bytes:
+                self._rotate()
+
+    def _rotate(self):
+        # Sorts by time; the nanoseconds keep rotations within one second apart
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}-{os.getpid()}"
+        rotated = self.path.with_name(f"{self.path.stem}.{stamp}.jsonl")
+        try:
+            os.replace(self.path, rotated)
+        except OSError:              # another process rotated it first
+            return
+        try:
+            with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+        except OSError:
+            return
+        for old in rotated_files(self.path)[:-self.keep or None]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def rotated_files(path=LOG_FILE):
+    """Compressed logs, oldest first (the timestamp in the name sorts)."""
+    return sorted(path.parent.glob(f"{path.stem}.*.jsonl.gz"))
+
+
+def read_records(path=LOG_FILE):
+    """Every record in the rotated files and the live log, oldest first; bad lines are skipped."""
+    for name in [*rotated_files(path), path]:
+        try:
+            f = gzip.open(name, "rb") if name.suffix == ".gz" else open(name, "rb")
+        except OSError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:       # a line cut short by a crash
+                    continue
+
+
+# ---------- process-wide instance ----------
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_request_log():
+    """The shared log, or None when logging is off."""
+    global _log
+    if _log is None and ENABLED:
+        with _log_lock:
+            if _log is None:
+                _log = RequestLog()
+    return _log
+
+
+def log_request(kind, **fields):
+    if ENABLED:
+        (_log or get_request_log()).log(kind, **fields)
+
+
+# ---------- aggregation ----------
+def _prune(counts):
+    # Keep the heavier half; phrases seen only early in a huge log are undercounted
+    return Counter(dict(counts.most_common(MAX_KEYS // 2)))
+
+
+def top_phrases(records, n=500):
+    """``{"phrases": [...], "chat": [...]}``: the ``n`` most frequent translations and chat messages."""
+    phrases, chat = Counter(), Counter()
+    for record in records:
+        text = record.get("text") if isinstance(record, dict) else None
+        if not isinstance(text, str) or not text.strip():
+            continue
+        if record.get("kind") == "translate":
+            phrases[(normalize_text(text), record.get("source"), record.get("target"))] += 1
+            if len(phrases) > MAX_KEYS:
+                phrases = _prune(phrases)
+        elif record.get("kind") == "chat":
+            chat[normalize_text(text).casefold()] += 1
+            if len(chat) > MAX_KEYS:
+                chat = _prune(chat)
+    return {
+        "generated_at": time.time(),
+        "phrases": [{"text": text, "source": source, "target": target, "count": count}
+                    for (text, source, target), count in phrases.most_common(n)],
+        "chat": [{"text": text, "count": count} for text, count in chat.most_common(n)],
+    }
+
+
+def write_top(top, path=TOP_FILE):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(top, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_top(path=TOP_FILE):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+# ---------- prewarming ----------
+def prewarm(path=TOP_FILE, limit=PREWARM_TOP):
+    """Load the top phrases' cached translations into memory and build their phrase indexes."""
+    from content_store import get_store
+    from languages import content_languages
+    from translator import get_chain, lesson_phrase_index
+
+    top = load_top(path)
+    if not top:
+        return {"phrases": 0, "cached": 0, "indexes": 0}
+    chain = get_chain()
+    engines = [backend.name for backend in chain.backends if backend.cacheable]
+    phrases = top.get("phrases", [])[:limit]
+    cached = 0
+    pairs = set()
+    for phrase in phrases:
+        text, source, target = phrase["text"], phrase["source"], phrase["target"]
+        if not (source and target):
+            continue
+        pairs.add(tuple(sorted((source, target))))
+        if chain.cache is not None and any(chain.cache.preload(text, source, target, e) for e in engines):
+            cached += 1
+    languages = content_languages(get_store().content())
+    indexes = [pair for pair in pairs if pair[0] in languages and pair[1] in languages]
+    for a, b in indexes:
+        lesson_phrase_index(a, b)
+    return {"phrases": len(phrases), "cached": cached, "indexes": len(indexes)}
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start_from_env():
+    """Prewarm once per process, in the background, when a top-phrase file exists."""
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        if os.environ.get("LINGO_PREWARM", "1").lower() in ("0", "false", "no", "off") or not TOP_FILE.exists():
+            return
+        threading.Thread(target=prewarm, name="prewarm", daemon=True).start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate the request log and prewarm caches.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    top_parser = sub.add_parser("top", help="write the most frequent phrases to the top-phrase file")
+    top_parser.add_argument("--n", type=int, default=500)
+    top_parser.add_argument("--log", default=str(LOG_FILE))
+    top_parser.add_argument("--out", default=str(TOP_FILE))
+    top_parser.add_argument("--translate", action="store_true",
+                            help="translate top phrases missing from the cache through the backend chain")
+    sub.add_parser("prewarm", help="prewarm this process's caches from the top-phrase file")
+    args = parser.parse_args(argv)
+
+    if args.command == "prewarm":
+        started = time.perf_counter()
+        stats = prewarm()
+        print(f"prewarmed {stats['cached']}/{stats['phrases']} phrases and {stats['indexes']} phrase indexes "
+              f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return 0
+
+    started = time.perf_counter()
+    top = top_phrases(read_records(Path(args.log)), args.n)
+    write_top(top, Path(args.out))
+    print(f"{len(top['phrases'])} phrases, {len(top['chat'])} chat messages -> {args.out} "
+          f"in {time.perf_counter() - started:.1f} s")
+    if args.translate:
+        from translator import get_chain
+        chain = get_chain()
+        translated = sum(1 for p in top["phrases"] if p["source"] and p["target"]
+                         and chain.translate(p["text"], p["source"], p["target"])[0])
+        print(f"{translated}/{len(top['phrases'])} phrases translated and cached")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
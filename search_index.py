@@ -0,0 +1,262 @@
+"""Inverted index over the text of every lesson item, in all its languages.
+
+Terms are folded before indexing and querying: casefold, ä→ae, ö→oe,
+ü→ue, ß→ss, and other accents dropped.  "Straße", "strasse" and "STRASSE"
+are therefore the same term, and "Mädchen" is found by "maedchen" as well.
+
+Every query word is a prefix, so results appear while typing.  Prefixes are
+found by bisecting the sorted term list.  Each posting list is kept in rank
+order (shorter items first), so the top ``limit`` results are the first
+entries of one list or of a merge of a few lists.  A query never scores
+the whole corpus.
+
+Ranking: items where every word matches a whole term come first, then
+prefix-only matches.  Within each group, shorter items rank higher.
+
+The index follows content reloads incrementally: ``sync`` re-indexes only
+the lessons whose items changed (see ``get_search_index``).  Removed items
+leave dead slots behind; once they make up ``COMPACT_DEAD`` of all slots,
+the index is renumbered from the fingerprints it keeps, without the lessons.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+from languages import item_languages
+
+_FOLD = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+_WORD = re.compile(r"\w+")
+MAX_EXPANSIONS = 64              # prefix terms merged per query word
+COMPACT_DEAD = 0.5               # share of dead item slots that triggers compact()
+
+
+def fold(text: str) -> str:
+    text = text.casefold().translate(_FOLD)
+    if text.isascii():
+        return text
+    # é -> e, ñ -> n, ...
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def terms(text: str):
+    return _WORD.findall(fold(text))
+
+
+def _fingerprint(lesson):
+    return tuple(tuple((lang, item[lang]) for lang in item_languages(item)) for item in lesson.get("content", ()))
+
+
+class SearchIndex:
+    def __init__(self):
+        self.items = []                  # item number -> (lesson_id, index), None once removed
+        self.item_terms = []             # item number -> frozenset of terms
+        self.rank = []                   # item number -> static rank (smaller is better)
+        self.postings = {}               # term -> item numbers ordered by (rank, number)
+        self.terms = []                  # sorted list of every indexed term
+        self.by_lesson = {}              # lesson_id -> item numbers
+        self.fingerprints = {}           # lesson_id -> per item, its (language, text) pairs
+        self.dead = 0                    # removed item slots not yet compacted away
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return sum(len(numbers) for numbers in self.by_lesson.values())
+
+    # ---------- building ----------
+    def _key(self, n):
+        return (self.rank[n], n)
+
+    def add_lesson(self, lesson):
+        """Index (or re-index) one lesson."""
+        with self._lock:
+            self._finish(*self._add(lesson["lesson_id"], _fingerprint(lesson), set(), set()))
+            self._maybe_compact()
+
+    def _add(self, lesson_id, fingerprint, new_terms, touched):
+        # Appends postings unsorted; _finish restores the ordering once per batch
+        self.remove_lesson(lesson_id)
+        numbers = []
+        for index, fields in enumerate(fingerprint):
+            n = len(self.items)
+            self.items.append((lesson_id, index))
+            item_terms = frozenset(term for _, text in fields for term in terms(text))
+            self.item_terms.append(item_terms)
+            self.rank.append(sum(len(text) for _, text in fields))
+            for term in item_terms:
+                posting = self.postings.get(term)
+                if posting is None:
+                    self.postings[term] = [n]
+                    new_terms.add(term)
+                else:
+                    posting.append(n)
+                    touched.add(term)
+            numbers.append(n)
+        self.by_lesson[lesson_id] = numbers
+        self.fingerprints[lesson_id] = fingerprint
+        return new_terms, touched
+
+    def _finish(self, new_terms, touched):
+        for term in touched:
+            self.postings[term].sort(key=self._key)
+        if len(new_terms) > len(self.terms) // 8:
+            self.terms = sorted(self.postings)
+        else:
+            for term in new_terms:
+                insort(self.terms, term)
+
+    def remove_lesson(self, lesson_id):
+        with self._lock:
+            for n in self.by_lesson.pop(lesson_id, ()):
+                for term in self.item_terms[n]:
+                    posting = self.postings[term]
+                    posting.remove(n)
+                    if not posting:
+                        del self.postings[term]
+                        i = bisect_left(self.terms, term)
+                        if i < len(self.terms) and self.terms[i] == term:   # not yet listed mid-batch
+                            del self.terms[i]
+                self.items[n] = None
+                self.item_terms[n] = frozenset()
+                self.dead += 1
+            self.fingerprints.pop(lesson_id, None)
+
+    def _maybe_compact(self):
+        if self.dead > COMPACT_DEAD * len(self.items):
+            self.compact()
+
+    def compact(self):
+        """Renumber the live items densely, dropping the slots of removed ones."""
+        with self._lock:
+            lessons = [(lesson_id, self.fingerprints[lesson_id]) for lesson_id in self.by_lesson]
+            self.items, self.item_terms, self.rank = [], [], []
+            self.postings, self.terms, self.by_lesson, self.fingerprints = {}, [], {}, {}
+            self.dead = 0
+            new_terms, touched = set(), set()
+            for lesson_id, fingerprint in lessons:
+                self._add(lesson_id, fingerprint, new_terms, touched)
+            self._finish(new_terms, touched)
+
+    def sync(self, lessons):
+        """Make the index match ``lessons``, touching only added/changed/removed lessons."""
+        with self._lock:
+            seen = set()
+            new_terms, touched = set(), set()
+            for lesson in lessons:
+                lesson_id = lesson["lesson_id"]
+                seen.add(lesson_id)
+                fingerprint = _fingerprint(lesson)
+                if self.fingerprints.get(lesson_id) != fingerprint:
+                    self._add(lesson_id, fingerprint, new_terms, touched)
+            # Terms that were new in this batch and vanished again are skipped
+            self._finish({t for t in new_terms if t in self.postings}, {t for t in touched if t in self.postings})
+            for lesson_id in [lid for lid in self.by_lesson if lid not in seen]:
+                self.remove_lesson(lesson_id)
+            self._maybe_compact()
+        return self
+
+    @classmethod
+    def from_lessons(cls, lessons):
+        return cls().sync(lessons)
+
+    # ---------- querying ----------
+    def _hit(self, n):
+        # The item is rebuilt from its fingerprint; the index holds no decoded lessons
+        lesson_id, index = self.items[n]
+        return lesson_id, index, dict(self.fingerprints[lesson_id][index])
+
+    def _expand(self, word):
+        """Posting lists for ``word``: the exact term's first, then up to MAX_EXPANSIONS longer terms."""
+        exact = self.postings.get(word)
+        prefixed = []
+        i = bisect_left(self.terms, word)
+        while i < len(self.terms) and len(prefixed) < MAX_EXPANSIONS:
+            term = self.terms[i]
+            if not term.startswith(word):
+                break
+            if term != word:
+                prefixed.append(self.postings[term])
+            i += 1
+        return exact, prefixed
+
+    def _with_prefix(self, word):
+        """Every indexed term starting with ``word``, or None if there are more than MAX_EXPANSIONS."""
+        lo = bisect_left(self.terms, word)
+        hi = bisect_left(self.terms, word[:-1] + chr(ord(word[-1]) + 1), lo, lo + MAX_EXPANSIONS + 1)
+        if hi > lo + MAX_EXPANSIONS:
+            return None
+        return frozenset(self.terms[lo:hi])
+
+    def _ranked(self, word):
+        """Item numbers containing ``word``: exact-term hits by rank, then prefix hits by rank."""
+        exact, prefixed = self._expand(word)
+        if exact:
+            yield from exact
+        if prefixed:
+            seen = set(exact or ())
+            for n in heapq.merge(*prefixed, key=self._key):
+                if n not in seen:
+                    seen.add(n)
+                    yield n
+
+    def search(self, query, limit=20):
+        """Best ``limit`` matches as ``(lesson_id, index, item)`` tuples.
+
+        Multi-word queries stop scanning after ``4 * limit`` hits, so prefix-only
+        matches beyond that are not considered.
+        """
+        words = terms(query)
+        if not words:
+            return []
+        with self._lock:
+            if len(words) == 1:
+                results = []
+                for n in self._ranked(words[0]):
+                    results.append(self._hit(n))
+                    if len(results) >= limit:
+                        break
+                return results
+            # Walk the word with the fewest candidates; check the others per item
+            counts = []
+            for word in words:
+                exact, prefixed = self._expand(word)
+                counts.append((len(exact or ()) + sum(map(len, prefixed)), word))
+            driver = min(counts)[1]
+            others = [(word, self._with_prefix(word)) for word in words if word != driver]
+            exact_hits, prefix_hits = [], []
+            for n in self._ranked(driver):
+                item_terms = self.item_terms[n]
+                whole = driver in item_terms
+                for word, matching in others:
+                    if word in item_terms:
+                        continue
+                    if matching is not None:
+                        if item_terms.isdisjoint(matching):
+                            break
+                    elif not any(term.startswith(word) for term in item_terms):
+                        break
+                    whole = False
+                else:
+                    (exact_hits if whole else prefix_hits).append(n)
+                    if len(exact_hits) >= limit or len(exact_hits) + len(prefix_hits) >= 4 * limit:
+                        break
+            ranked = sorted(exact_hits, key=self._key) + sorted(prefix_hits, key=self._key)
+            return [self._hit(n) for n in ranked[:limit]]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index(content) -> SearchIndex:
+    """The process-wide index, synced to ``content`` once per content version."""
+    def build(c):
+        global _index
+        with _index_lock:
+            if _index is None:
+                _index = SearchIndex.from_lessons(c.lessons)
+            else:
+                _index.sync(c.lessons)
+            return _index
+
+    return content.derived("search_index", build)
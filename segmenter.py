@@ -0,0 +1,100 @@
+"""Split text into sentence segments that can be translated independently.
+
+``split_segments`` returns ``(segment, separator)`` pairs.
+``"".join(s + sep for s, sep in pairs)`` rebuilds the original text, so
+translated segments can be put back together with the original spacing and
+line breaks.  ``limit_segments`` further splits sentences that are too long
+for one upstream request.  It breaks them at clause punctuation first, then
+between words.
+"""
+import re
+
+# A sentence ends at . ! ? … (plus closing quotes/brackets) followed by whitespace,
+# or at a line break.
+_BOUNDARY = re.compile(r"""(?<=[.!?…])["'”’)\]]*\s+|\n+\s*""")
+_CLAUSE = re.compile(r"(?<=[,;:–—])\s+")
+_SPACE = re.compile(r"\s+")
+
+
+def split_segments(text: str):
+    pairs = []
+    start = 0
+    for m in _BOUNDARY.finditer(text):
+        end = m.start()
+        # Keep closing quotes/brackets with the sentence they end
+        trail = len(m.group()) - len(m.group().lstrip("\"'”’)]"))
+        end += trail
+        if end > start:
+            pairs.append((text[start:end], text[end:m.end()]))
+        elif pairs:
+            sentence, sep = pairs[-1]
+            pairs[-1] = (sentence, sep + text[start:m.end()])
+        start = m.end()
+    if start < len(text):
+        pairs.append((text[start:], ""))
+    return pairs
+
+
+def _split_at(text, pattern):
+    pairs = []
+    start = 0
+    for m in pattern.finditer(text):
+        if m.start() == 0:           # leading whitespace stays with the first piece
+            continue
+        pairs.append((text[start:m.start()], m.group()))
+        start = m.end()
+    if start < len(text) or not pairs:
+        pairs.append((text[start:], ""))
+    return pairs
+
+
+def _cut(pair, max_size, size):
+    word, sep = pair
+    if size(word) <= max_size:
+        return [pair]
+    pieces = []
+    start = 0
+    for end in range(1, len(word) + 1):
+        if end - start > 1 and size(word[start:end]) > max_size:
+            pieces.append((word[start:end - 1], ""))
+            start = end - 1
+    pieces.append((word[start:], sep))
+    return pieces
+
+
+def limit_segments(pairs, max_size, size=len):
+    """``pairs`` with every segment larger than ``max_size`` split into smaller ones.
+
+    ``size`` measures a string (characters by default; pass e.g.
+    ``lambda s: len(s.encode("utf-8"))`` for a byte limit).  A single word
+    larger than ``max_size`` (e.g. unspaced CJK text) is cut between
+    characters.
+    """
+    out = []
+    for segment, sep in pairs:
+        if size(segment) <= max_size:
+            out.append((segment, sep))
+            continue
+        units = []
+        for clause, clause_sep in _split_at(segment, _CLAUSE):
+            if size(clause) <= max_size:
+                units.append((clause, clause_sep))
+            else:
+                words = [piece for word in _split_at(clause, _SPACE) for piece in _cut(word, max_size, size)]
+                last, last_sep = words[-1]
+                units.extend(words[:-1] + [(last, last_sep + clause_sep)])
+        # Pack consecutive units greedily up to max_chars
+        text, unit_sep = units[0]
+        for unit, next_sep in units[1:]:
+            if size(text) + size(unit_sep) + size(unit) <= max_size:
+                text += unit_sep + unit
+            else:
+                out.append((text, unit_sep))
+                text = unit
+            unit_sep = next_sep
+        out.append((text, unit_sep + sep))
+    return out
+
+
+def join_segments(pairs) -> str:
+    return "".join(segment + sep for segment, sep in pairs)
@@ -0,0 +1,193 @@
+"""SM-2 spaced repetition over individual lesson items.
+
+A card is one lesson item, whatever languages it has.  ``CardCatalog`` numbers the cards
+densely, ordered by (lesson_id, item index), once per content version.  It
+keeps only the keys; ``item`` fetches a card's text from the content.  A
+learner's ``Deck`` keeps its card state in parallel typed arrays, a few
+bytes per card.  Card numbers shift when lessons or items are added or
+removed, so a deck remembers the catalog keys it was built for and
+``rebase`` moves its state onto a new catalog by (lesson_id, index).  Introduced cards sit in a binary heap keyed by due time.
+``next_due`` and ``review`` are therefore O(log n) even with 100k cards.
+Heap entries made stale by a later review are skipped lazily.
+"""
+import heapq
+import threading
+import time
+from array import array
+
+from languages import item_languages
+from phrase_index import normalize
+
+DAY = 86400.0
+AGAIN_DELAY = 60.0               # a failed card comes back within the session
+GRADES = {"again": 1, "hard": 3, "good": 4, "easy": 5}
+
+
+class CardCatalog:
+    def __init__(self, content):
+        # Built from ids and item counts; no lesson is decoded for the keys
+        order = sorted(range(len(content.lesson_ids)), key=lambda i: content.lesson_ids[i])
+        self.keys = [(content.lesson_ids[i], index) for i in order for index in range(content.item_counts[i])]
+        self.number = {key: n for n, key in enumerate(self.keys)}
+        self.by_lesson = {}
+        for n, (lid, _) in enumerate(self.keys):
+            self.by_lesson.setdefault(lid, []).append(n)
+        self._lessons = content.lesson_by_id
+        self._by_text = None              # normalized text in any language -> card number
+        self._by_text_lock = threading.Lock()
+
+    @property
+    def by_text(self):
+        # Normalizes every text of every item, so it waits for the first find()
+        if self._by_text is None:
+            with self._by_text_lock:
+                if self._by_text is None:
+                    by_text = {}
+                    for lid in self.by_lesson:
+                        for index, item in enumerate(self._lessons[lid].get("content", ())):
+                            for lang in item_languages(item):
+                                by_text.setdefault(normalize(item[lang]), self.number[(lid, index)])
+                    self._by_text = by_text
+        return self._by_text
+
+    def item(self, card):
+        lesson_id, index = self.keys[card]
+        return self._lessons[lesson_id]["content"][index]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, text):
+        """Card number with a text in any language matching ``text`` (normalized), or None."""
+        return self.by_text.get(normalize(text))
+
+
+class Deck:
+    """Per-learner card state in compact arrays plus a due-time heap."""
+
+    def __init__(self, size=0, keys=None):
+        self.keys = keys                 # catalog keys of cards 0..size-1
+        self.ease = array("f")
+        self.interval = array("f")       # days
+        self.reps = array("H")
+        self.lapses = array("H")
+        self.due = array("d")            # epoch seconds; 0 = not introduced yet
+        self.heap = []                   # (due, card)
+        self.introduced = 0
+        self.resize(size)
+
+    def __len__(self):
+        return len(self.due)
+
+    def resize(self, size):
+        """Grow the arrays to ``size`` cards."""
+        grow = size - len(self.due)
+        if grow > 0:
+            self.ease.extend([2.5] * grow)
+            self.interval.extend([0.0] * grow)
+            self.reps.extend([0] * grow)
+            self.lapses.extend([0] * grow)
+            self.due.extend([0.0] * grow)
+
+    def is_introduced(self, card) -> bool:
+        return self.due[card] > 0
+
+    def introduce(self, cards, now=None):
+        """Make new cards due now; already-introduced cards are left alone."""
+        now = time.time() if now is None else now
+        for card in cards:
+            if self.due[card] == 0:
+                self.due[card] = now
+                self.introduced += 1
+                heapq.heappush(self.heap, (now, card))
+
+    def _drop_stale(self):
+        heap, due = self.heap, self.due
+        while heap and heap[0][0] != due[heap[0][1]]:
+            heapq.heappop(heap)
+
+    def next_due(self, now=None):
+        """The card due soonest if it is due by ``now``, else None."""
+        now = time.time() if now is None else now
+        self._drop_stale()
+        if self.heap and self.heap[0][0] <= now:
+            return self.heap[0][1]
+        return None
+
+    def next_due_at(self):
+        self._drop_stale()
+        return self.heap[0][0] if self.heap else None
+
+    def review(self, card, grade, now=None):
+        """Apply an SM-2 review. ``grade`` is 0-5 or a name from GRADES."""
+        quality = GRADES.get(grade, grade)
+        now = time.time() if now is None else now
+        if self.due[card] == 0:
+            self.introduced += 1
+        if quality < 3:
+            self.reps[card] = 0
+            self.lapses[card] = min(self.lapses[card] + 1, 0xFFFF)
+            self.interval[card] = 0.0
+            due = now + AGAIN_DELAY
+        else:
+            reps = min(self.reps[card] + 1, 0xFFFF)
+            self.reps[card] = reps
+            if reps == 1:
+                interval = 1.0
+            elif reps == 2:
+                interval = 6.0
+            else:
+                interval = self.interval[card] * self.ease[card]
+            self.interval[card] = interval
+            due = now + interval * DAY
+        self.ease[card] = max(1.3, self.ease[card] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due[card] = due
+        heapq.heappush(self.heap, (due, card))
+        # Keep stale entries from piling up
+        if len(self.heap) > 2 * self.introduced + 64:
+            self.rebuild_heap()
+
+    def rebuild_heap(self):
+        self.heap = [(d, card) for card, d in enumerate(self.due) if d > 0]
+        heapq.heapify(self.heap)
+
+    def state(self, card):
+        """Row for persistence: (ease, interval, reps, lapses, due)."""
+        return (self.ease[card], self.interval[card], self.reps[card], self.lapses[card], self.due[card])
+
+    @classmethod
+    def from_rows(cls, size, rows):
+        """Rebuild a deck from persisted ``(card, ease, interval, reps, lapses, due)`` rows."""
+        deck = cls(size)
+        for card, ease, interval, reps, lapses, due in rows:
+            if 0 <= card < size:
+                deck.ease[card], deck.interval[card] = ease, interval
+                deck.reps[card], deck.lapses[card], deck.due[card] = reps, lapses, due
+                deck.introduced += due > 0
+        deck.rebuild_heap()
+        return deck
+
+    @classmethod
+    def for_catalog(cls, catalog, rows=()):
+        """A deck over ``catalog`` from ``(lesson_id, index, ease, interval, reps, lapses, due)`` rows.
+
+        Rows whose item is no longer in the catalog are dropped.
+        """
+        number = catalog.number
+        deck = cls.from_rows(len(catalog), [
+            (number[(lid, index)], *state) for lid, index, *state in rows if (lid, index) in number])
+        deck.keys = catalog.keys
+        return deck
+
+    def rebase(self, catalog):
+        """The same card state over ``catalog``, matched by key (``self`` if the keys are unchanged)."""
+        if catalog.keys is self.keys:
+            return self
+        if self.keys == catalog.keys:
+            self.keys = catalog.keys
+            return self
+        return Deck.for_catalog(catalog, self.rows())
+
+    def rows(self):
+        """``(lesson_id, index, ease, interval, reps, lapses, due)`` of every introduced card."""
+        return [(*key, *self.state(card)) for card, key in enumerate(self.keys or ()) if self.due[card] > 0]
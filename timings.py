@@ -0,0 +1,86 @@
+"""Cold-start and per-rerun timings.
+
+main.py imports this module first, so ``PROCESS_START`` is (close to) the
+moment the app script was first loaded.  ``importing`` times a block of
+imports once per process.  Page modules are timed the first time they are
+shown.  ``rerun`` times a whole script run.
+
+Set ``LINGO_TIMINGS=1`` to log one line per rerun (logger ``lingo.timings``)
+and to show the report in the sidebar.  The numbers are collected either way.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+ENABLED = os.environ.get("LINGO_TIMINGS", "0") == "1"
+RECENT_RERUNS = 200
+
+PROCESS_START = time.perf_counter()
+log = logging.getLogger("lingo.timings")
+
+imports = {}                     # what -> seconds, first import only
+cold_start = None                # seconds from process start to the end of the first rerun
+reruns = deque(maxlen=RECENT_RERUNS)   # (page, seconds)
+_lock = threading.Lock()
+
+
+@contextmanager
+def importing(what):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _lock:
+            imports.setdefault(what, time.perf_counter() - started)
+
+
+@contextmanager
+def rerun(page):
+    global cold_start
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        finished = time.perf_counter()
+        seconds = finished - started
+        with _lock:
+            reruns.append((page, seconds))
+            if cold_start is None:
+                cold_start = finished - PROCESS_START
+        if ENABLED:
+            log.info("rerun page=%s %.1fms", page, seconds * 1000)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report() -> dict:
+    with _lock:
+        recent = [seconds for _, seconds in reruns]
+        return {
+            "cold_start": cold_start,
+            "imports": dict(imports),
+            "reruns": len(recent),
+            "rerun_p50": percentile(recent, 0.50),
+            "rerun_p95": percentile(recent, 0.95),
+            "last": reruns[-1] if reruns else None,
+        }
+
+
+def sidebar_report(st):
+    """Render ``report()`` in a collapsed sidebar expander."""
+    data = report()
+    with st.sidebar.expander("⏱ Timings"):
+        if data["cold_start"] is not None:
+            st.caption(f"Cold start: {data['cold_start'] * 1000:.0f} ms")
+        st.caption(f"Reruns: {data['reruns']} · p50 {data['rerun_p50'] * 1000:.1f} ms · "
+                   f"p95 {data['rerun_p95'] * 1000:.1f} ms")
+        for what, seconds in sorted(data["imports"].items(), key=lambda kv: -kv[1]):
+            st.caption(f"import {what}: {seconds * 1000:.1f} ms")
@@ -0,0 +1,201 @@
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("LINGO_CACHE_DIR", Path(__file__).parent / ".cache"))
+CACHE_FILE = CACHE_DIR / "translations.sqlite3"
+
+MEMORY_MAX_ENTRIES = 4096
+DISK_MAX_ENTRIES = 200_000
+DEFAULT_TTL = 7 * 24 * 3600          # seconds
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used in cache keys: NFC, trimmed, single spaces."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationCache:
+    """Two-tier translation cache: an in-process LRU in front of a SQLite file.
+
+    The SQLite file runs in WAL mode so several Streamlit worker processes can
+    read and write it at the same time; it survives restarts.  Entries older
+    than ``ttl`` seconds are treated as misses in both tiers.
+
+    ``_lock`` guards only the memory tier and the stats; disk reads and writes
+    take ``_db_lock`` instead, so a slow or locked disk never holds up memory
+    hits in other sessions.
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=MEMORY_MAX_ENTRIES,
+                 ttl=DEFAULT_TTL, disk_max_entries=DISK_MAX_ENTRIES):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self._mem = OrderedDict()            # key -> (value, stored_at)
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()     # one statement/commit at a time on the shared connection
+        self._db = None
+        self._writes = 0
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        if self.path is not None:
+            self._open_db()
+
+    # ---------- disk tier ----------
+    def _open_db(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " text TEXT NOT NULL, source TEXT NOT NULL, target TEXT NOT NULL,"
+                " engine TEXT NOT NULL, value TEXT NOT NULL, stored_at REAL NOT NULL,"
+                " PRIMARY KEY (text, source, target, engine))"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS translations_age ON translations (stored_at)")
+            db.commit()
+            self._db = db
+        except sqlite3.Error:
+            # A read-only or broken cache dir should never break translation.
+            self._db = None
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                return self._db.execute(
+                    "SELECT value, stored_at FROM translations"
+                    " WHERE text=? AND source=? AND target=? AND engine=?", key
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+
+    def _disk_put(self, key, value, stored_at):
+        if self._db is None:
+            return
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, value, stored_at),
+                )
+                self._db.commit()
+                self._writes += 1
+                if self._writes % 1000 == 0:
+                    self._prune()
+            except sqlite3.Error:
+                pass
+
+    def _prune(self):
+        self._db.execute("DELETE FROM translations WHERE stored_at < ?", (time.time() - self.ttl,))
+        self._db.execute(
+            "DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations"
+            " ORDER BY stored_at DESC LIMIT -1 OFFSET ?)", (self.disk_max_entries,)
+        )
+        self._db.commit()
+
+    # ---------- public API ----------
+    @staticmethod
+    def make_key(text, source, target, engine):
+        return (normalize_text(text), source or "auto", target, engine)
+
+    def get(self, text, source, target, engine):
+        """Return the cached translation or ``None``."""
+        key = self.make_key(text, source, target, engine)
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if now - entry[1] <= self.ttl:
+                    self._mem.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry[0]
+                del self._mem[key]
+        row = self._disk_get(key)
+        with self._lock:
+            if row is not None and now - row[1] <= self.ttl:
+                if key not in self._mem:     # a put() while we read the disk wins
+                    self._remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                return row[0]
+            self.stats["misses"] += 1
+            return None
+
+    def preload(self, text, source, target, engine) -> bool:
+        """Copy a disk entry into the memory tier without touching the hit/miss stats."""
+        key = self.make_key(text, source, target, engine)
+        with self._lock:
+            if key in self._mem:
+                return True
+        row = self._disk_get(key)
+        if row is None or time.time() - row[1] > self.ttl:
+            return False
+        with self._lock:
+            if key not in self._mem:         # a put() while we read the disk wins
+                self._remember(key, row[0], row[1])
+            return True
+
+    def put(self, text, source, target, engine, value):
+        if not value:
+            return
+        key = self.make_key(text, source, target, engine)
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self.stats["stores"] += 1
+        self._disk_put(key, value, now)
+
+    def _remember(self, key, value, stored_at):
+        self._mem[key] = (value, stored_at)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def get_or_compute(self, text, source, target, engine, compute):
+        """Return a cached value, or call ``compute()`` and cache a truthy result."""
+        value = self.get(text, source, target, engine)
+        if value is None:
+            value = compute()
+            if value:
+                self.put(text, source, target, engine, value)
+        return value
+
+    def snapshot(self):
+        """Counters plus sizes, for display."""
+        with self._lock:
+            out = dict(self.stats)
+            out["memory_entries"] = len(self._mem)
+        lookups = out["hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = (out["hits"] + out["disk_hits"]) / lookups if lookups else 0.0
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM translations")
+                self._db.commit()
+
+
+# ---------- process-wide instance ----------
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> TranslationCache:
+    """The shared cache used by every session in this process."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = TranslationCache()
+    return _cache
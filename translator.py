@@ -0,0 +1,192 @@
+"""Single entry point for translation used by every page.
+
+The backend order comes from ``LINGO_BACKENDS`` (comma separated names).
+Endpoint URLs can be overridden, e.g. to point at a local stand-in server:
+``LINGO_LIBRETRANSLATE_URL``, ``LINGO_MYMEMORY_URL``.
+
+Any language pair can be requested.  When no backend pairs the two
+languages directly, the chain translates through English (see
+``languages.PIVOT``).
+
+Inputs longer than ``SEGMENT_CHARS`` are split into sentences, and
+sentences longer than ``MAX_SEGMENT_BYTES`` are split further (see
+segmenter.py).  Segments that the dictionary, the lessons or the cache
+already know are answered on the calling thread.  The others are
+translated concurrently, at most ``SEGMENT_PARALLEL`` at a time per call,
+so a paragraph takes about as long as its slowest sentence.  The result is
+put back together in the original order and spacing.  Dictionary and lesson
+answers are stored lowercase without punctuation, so a segment they answer
+gets the source sentence's leading capital and closing punctuation back.  A
+segment that cannot
+be translated keeps its original text, and the call fails only if no
+segment could be translated.
+"""
+import os
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from backends import (BackendChain, LessonCorpusBackend, LibreTranslateBackend,
+                      LocalDictBackend, LocalModelBackend, MyMemoryBackend)
+from content_store import get_store
+from languages import PIVOT, content_languages, default_source
+from phrase_index import PhraseIndex
+from request_log import LOGGED_TEXT, log_request
+from segmenter import join_segments, limit_segments, split_segments
+from translation_cache import get_cache
+
+LOCAL_DICT = {
+    "hello": "hallo",
+    "good morning": "guten morgen",
+    "thank you": "danke",
+    "please": "bitte",
+    "goodbye": "auf wiedersehen",
+    "how are you?": "wie geht's?",
+    "i am fine": "mir geht es gut",
+    "see you soon": "bis bald",
+    "yes": "ja",
+    "no": "nein"
+}
+
+DEFAULT_ORDER = "dict,lessons,local_model,mymemory,libretranslate"
+FAILED_MESSAGE = "Translation failed."
+SEGMENT_CHARS = int(os.environ.get("LINGO_SEGMENT_CHARS", "120"))     # longer inputs are segmented
+MAX_SEGMENT_BYTES = 450           # MyMemory truncates queries past 500 bytes of UTF-8
+SEGMENT_PARALLEL = int(os.environ.get("LINGO_SEGMENT_PARALLEL", "4"))
+
+_segment_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="translate-segment")
+_CLOSING = re.compile(r"""[.!?…:;,]+["'”’»)\]]*\Z""")
+
+
+def lesson_phrase_index(source="en", target="de") -> PhraseIndex:
+    """Phrase index for one language pair of the current lesson content.
+
+    Built on first use of the pair and rebuilt when lessons change, so only
+    the pairs a session translates are held in memory.
+    """
+    pair = tuple(sorted((source, target)))
+    return get_store().content().derived(f"phrase_index:{pair[0]}:{pair[1]}",
+                                         lambda c: PhraseIndex.from_lessons(c.lessons, languages=pair))
+
+
+def lesson_languages():
+    return content_languages(get_store().content())
+
+
+def make_backends():
+    """All known backends by name, configured from the environment."""
+    timeout = float(os.environ.get("LINGO_HTTP_TIMEOUT", "8"))
+    backends = [
+        LocalDictBackend(LOCAL_DICT),
+        LessonCorpusBackend(lesson_phrase_index, lesson_languages),
+        LocalModelBackend(),
+        MyMemoryBackend(os.environ.get("LINGO_MYMEMORY_URL", "https://api.mymemory.translated.net/get"),
+                        timeout=timeout),
+        LibreTranslateBackend(os.environ.get("LINGO_LIBRETRANSLATE_URL", "https://libretranslate.com/translate"),
+                              timeout=timeout),
+    ]
+    return {b.name: b for b in backends}
+
+
+def build_chain(order=None) -> BackendChain:
+    order = order or os.environ.get("LINGO_BACKENDS", DEFAULT_ORDER)
+    available = make_backends()
+    names = [n.strip() for n in order.split(",") if n.strip()]
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise ValueError(f"Unknown translation backends: {unknown}; known: {sorted(available)}")
+    return BackendChain(
+        [available[n] for n in names],
+        cache=get_cache(),
+        hedge_delay=float(os.environ.get("LINGO_HEDGE_MS", "1500")) / 1000,
+        timeout=float(os.environ.get("LINGO_HTTP_TIMEOUT", "8")) + 2,
+        pivot=PIVOT,
+    )
+
+
+_chain = None
+_chain_lock = threading.Lock()
+
+
+def get_chain() -> BackendChain:
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                _chain = build_chain()
+    return _chain
+
+
+def translate_text(text: str, target: str = "de", source: str = None) -> str:
+    text = text.strip()
+    if not text:
+        return ""
+    source = source or default_source(target)
+    if source == target:
+        return text
+    if len(text) > SEGMENT_CHARS:
+        return translate_segments(text, source, target)
+    return _translate_one(text, source, target)[0] or FAILED_MESSAGE
+
+
+def _translate_one(text, source, target, lookup=False, looked_up=False):
+    chain = get_chain()
+    if lookup:
+        translated, backend = chain.lookup(text, source, target)
+    else:
+        translated, backend = chain.translate(text, source, target, looked_up=looked_up)
+    if translated or not lookup:
+        log_request("translate", text=text[:LOGGED_TEXT], source=source, target=target, backend=backend)
+    return translated, backend
+
+
+def _utf8_len(text):
+    return len(text.encode("utf-8"))
+
+
+def _match_form(sentence, translated):
+    """``translated`` with ``sentence``'s leading capital and closing punctuation."""
+    closing = _CLOSING.search(sentence)
+    if closing and not _CLOSING.search(translated):
+        translated += closing.group()
+    if sentence[:1].isupper() and translated[:1].islower():
+        translated = translated[0].upper() + translated[1:]
+    return translated
+
+
+def translate_segments(text: str, source: str, target: str, parallel: int = SEGMENT_PARALLEL) -> str:
+    pairs = limit_segments(split_segments(text), MAX_SEGMENT_BYTES, size=_utf8_len)
+    local = {backend.name for backend in get_chain().backends if not backend.remote}
+
+    def resolve(sentence, result):
+        translated, backend = result
+        # A pivot answer ("a+b") is shaped by its last backend
+        if translated and backend.rpartition("+")[2] in local:
+            translated = _match_form(sentence, translated)
+        translations[sentence] = translated
+
+    # Identical sentences are translated once
+    translations = {}
+    for segment, _ in pairs:
+        sentence = segment.strip()
+        if sentence and sentence not in translations:
+            resolve(sentence, _translate_one(sentence, source, target, lookup=True))
+
+    queue = [sentence for sentence, translated in translations.items() if translated is None]
+    pending = {}
+    while queue or pending:
+        while queue and len(pending) < parallel:
+            sentence = queue.pop(0)
+            # The lookup pass already missed in the cache and the inline backends
+            pending[_segment_executor.submit(_translate_one, sentence, source, target, looked_up=True)] = sentence
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            resolve(pending.pop(fut), fut.result())
+
+    if not any(translations.values()):
+        return FAILED_MESSAGE
+    # Keep leading/trailing spaces of each segment; untranslated segments stay as they were
+    return join_segments(
+        (segment.replace(segment.strip(), translations.get(segment.strip()) or segment.strip(), 1), sep)
+        for segment, sep in pairs
+    )
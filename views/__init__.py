@@ -0,0 +1,28 @@
+"""Pages of the app, one module per page, each with a ``render()``.
+
+A page module is imported the first time the page is shown.  The quiz
+generator, the translation backends and the chatbot matcher are therefore
+only loaded by processes that actually use them.
+"""
+import importlib
+
+import metrics
+import timings
+
+PAGES = {
+    "Home": "views.home",
+    "Lessons": "views.lessons",
+    "Translator": "views.translator",
+    "Quiz": "views.quiz",
+    "Review": "views.review",
+    "Chatbot": "views.chatbot",
+    "Progress": "views.progress",
+    "Export": "views.export",
+}
+RENDER_SECONDS = metrics.Histogram("lingo_page_render_seconds", "Script run time by page", ("page",))
+
+
+def load(page):
+    """The module rendering ``page``, imported on first use."""
+    with timings.importing(PAGES[page]):
+        return importlib.import_module(PAGES[page])
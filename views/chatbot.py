@@ -0,0 +1,69 @@
+"""Chatbot page: rule-based German conversation practice."""
+import streamlit as st
+
+from app_state import add_chat_turn, clear_chat
+from chatbot import get_german_response
+
+PAGE_MESSAGES = 20                # messages shown at first and added per "Load older"
+
+
+def render():
+    st.header("🤖 German Chatbot")
+    st.write("Chatte mit einem freundlichen deutschen Sprachassistenten")
+
+    # Initialize chat history
+    if "chat_input_key" not in st.session_state:
+        st.session_state.chat_input_key = 0
+    if "chat_window" not in st.session_state:
+        st.session_state.chat_window = PAGE_MESSAGES
+
+    # Display the newest messages only; older ones are paged in on request
+    history = st.session_state.chat_history
+    hidden = len(history) - st.session_state.chat_window
+    if hidden > 0 and st.button(f"⬆️ Load older ({hidden} more)", key="chat_load_older"):
+        st.session_state.chat_window += PAGE_MESSAGES
+        st.rerun()
+    for msg in history.window(st.session_state.chat_window):
+        speaker = "You" if msg.role == "user" else "Bot"
+        st.markdown(f"**{speaker}:** {msg.text}")
+
+    # User input at the bottom
+    with st.form("chat_form", clear_on_submit=True):
+        user_input = st.text_input("You:", key=f"chat_input_{st.session_state.chat_input_key}")
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            submitted = st.form_submit_button("Send")
+        with col2:
+            clear_chat_clicked = st.form_submit_button("Clear Chat")
+    
+    if submitted and user_input.strip():
+        # Generate bot reply and store both turns
+        bot_reply = get_german_response(user_input)
+        add_chat_turn(user_input, bot_reply)
+        # Increment the key to reset the text input; back to the newest page
+        st.session_state.chat_input_key += 1
+        st.session_state.chat_window = PAGE_MESSAGES
+        st.rerun()
+    
+    if clear_chat_clicked:
+        clear_chat()
+        st.session_state.chat_input_key += 1
+        st.session_state.chat_window = PAGE_MESSAGES
+        st.rerun()
+
+    # Add some conversation starters
+    st.write("---")
+    st.write("**Konversationsstarter:**")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.button("Hallo! Wie geht's?"):
+            add_chat_turn("Hallo! Wie geht's?", "Hallo! Mir geht es gut, danke! Und dir?")
+            st.rerun()
+    with col2:
+        if st.button("Was machst du?"):
+            add_chat_turn("Was machst du?", "Ich helfe Menschen, Deutsch zu lernen! Und du?")
+            st.rerun()
+    with col3:
+        if st.button("Danke für die Hilfe"):
+            add_chat_turn("Danke für die Hilfe", "Gern geschehen! Viel Erfolg beim Deutschlernen!")
+            st.rerun()
@@ -0,0 +1,165 @@
+"""Export page: download and restore lesson progress as JSON.
+
+Version 2 files store the completed ids compactly (see ``progress_bits``);
+ids the encoding cannot hold go in a plain ``completed_other`` list.
+Version 1 files, with a plain ``completed`` list, are still imported.
+"""
+import datetime
+import json
+from itertools import chain
+
+import streamlit as st
+
+import app_state
+from app_state import set_completed
+from progress_bits import ENCODING, ProgressBits, decode_ids, encodable, encode_ids
+
+LISTED_LESSONS = 50               # completed lessons listed by name; the rest are counted
+
+
+def list_lessons(content, lesson_ids, icon):
+    for n, lesson_id in enumerate(lesson_ids):
+        if n == LISTED_LESSONS:
+            st.caption(f"… and {len(lesson_ids) - LISTED_LESSONS} more")
+            break
+        st.write(f"{icon} Lesson {lesson_id}: {content.title(lesson_id)}")
+
+
+def read_completed(data):
+    """Completed ids of a v1 or v2 progress file, lazily; ValueError if the file is malformed."""
+    if "completed_ids" in data:
+        if data.get("encoding", ENCODING) != ENCODING:
+            raise ValueError(f"unknown encoding {data['encoding']!r}")
+        if not isinstance(data["completed_ids"], str):
+            raise ValueError("'completed_ids' should be a string.")
+        other = data.get("completed_other", [])
+        if not isinstance(other, list):
+            raise ValueError("'completed_other' should be a list.")
+        return chain(decode_ids(data["completed_ids"]), other)
+    if "completed" not in data:
+        raise ValueError("'completed' field not found.")
+    if not isinstance(data["completed"], list):
+        raise ValueError("'completed' should be a list.")
+    return data["completed"]
+
+
+def render():
+    content = app_state.content()
+    completed = st.session_state.completed
+
+    st.header("📤 Export / Import Progress")
+    
+    # Export section
+    st.subheader("Export Your Progress")
+    st.write("Download your learning progress to backup or transfer it to another device.")
+    
+    # Create progress data with additional metadata
+    progress = {
+        "version": "2.0",
+        "export_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total_lessons": completed.total,
+        "completed_lessons": len(completed),
+        "encoding": ENCODING,
+        "completed_ids": encode_ids(lid for lid in completed if encodable(lid)),
+    }
+    other = [lid for lid in completed if not encodable(lid)]
+    if other:
+        progress["completed_other"] = other
+    
+    # Download button
+    st.download_button(
+        "📥 Download Progress (JSON)", 
+        json.dumps(progress, indent=2, ensure_ascii=False), 
+        file_name=f"german_learning_progress_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json", 
+        mime="application/json",
+        help="Download your complete learning progress as a JSON file"
+    )
+    
+    # Display current progress stats
+    st.write("---")
+    st.subheader("Current Progress Overview")
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        st.metric("Total Lessons", completed.total)
+    
+    with col2:
+        st.metric("Completed", len(completed))
+    
+    with col3:
+        st.metric("Completion Rate", f"{completed.ratio * 100:.1f}%")
+    
+    # Show completed lessons with names
+    if completed:
+        st.write("**Completed Lessons:**")
+        list_lessons(content, sorted(completed), "✅")
+    else:
+        st.info("No lessons completed yet. Complete some lessons to see your progress here!")
+    
+    st.write("---")
+    
+    # Import section
+    st.subheader("Import Progress")
+    st.write("Upload a previously exported progress file to restore your learning progress.")
+    
+    uploaded = st.file_uploader(
+        "Choose a progress JSON file", 
+        type=["json"],
+        help="Select a progress.json file that you previously exported from this app"
+    )
+    
+    if uploaded:
+        try:
+            # Read and parse the uploaded file
+            data = json.load(uploaded)
+            
+            # Validate the file structure and decode the ids straight into a bitset;
+            # ids of lessons that do not exist are dropped and counted
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError("expected a JSON object.")
+                imported = ProgressBits.for_content(content, read_completed(data))
+            except ValueError as e:
+                st.error(f"❌ Invalid progress file: {e}")
+            else:
+                if imported.ignored:
+                    st.warning(f"⚠️ File contains {imported.ignored} invalid lesson IDs. These will be ignored.")
+                set_completed(imported)
+                
+                # Show import results
+                st.success("✅ Progress imported successfully!")
+                
+                # Show import statistics
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.info(f"**Lessons imported:** {len(imported)}")
+                with col2:
+                    st.info(f"**Total available:** {imported.total}")
+                
+                # Show what was imported
+                if imported:
+                    st.write("**Imported lessons:**")
+                    list_lessons(content, sorted(imported), "📘")
+                
+                # Force a rerun to update the UI everywhere
+                st.rerun()
+                
+        except json.JSONDecodeError:
+            st.error("❌ Error: The uploaded file is not a valid JSON file.")
+        except Exception as e:
+            st.error(f"❌ An unexpected error occurred: {str(e)}")
+    
+    # Reset progress option (with confirmation)
+    st.write("---")
+    st.subheader("Reset Progress")
+    
+    if st.button("🔄 Reset All Progress", help="Clear all your completed lessons"):
+        if completed:
+            # Confirm reset
+            if st.checkbox("I understand this will delete all my progress permanently"):
+                if st.button("Confirm Reset"):
+                    set_completed(())
+                    st.success("✅ All progress has been reset!")
+                    st.rerun()
+        else:
+            st.info("No progress to reset. You haven't completed any lessons yet.")
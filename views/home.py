@@ -0,0 +1,28 @@
+"""Home page: overview of every lesson and overall progress."""
+import streamlit as st
+
+import app_state
+from languages import language_name
+
+
+def render():
+    content = app_state.content()
+
+    learning = app_state.language_pair()[1]
+    st.title(f"🌍 Lingo Translator — Learn {language_name(learning)}")
+    st.write("A lightweight learning app with lessons, translator, quizzes and a chatbot.")
+
+    # Progress
+    completed = st.session_state.completed
+    pct = int(completed.ratio * 100)
+    st.metric("Progress", f"{len(completed)}/{completed.total}", delta=f"{pct}%")
+    st.progress(pct)
+
+    st.write("**Available lessons**")
+    # Ids and titles only; lesson content is never decoded here
+    for lesson_id, title in zip(content.lesson_ids, content.lesson_titles):
+        status = "✅ Completed" if lesson_id in completed else "◻️ Not started"
+        st.write(f"**Lesson {lesson_id} — {title}** — *{status}*")
+
+    st.write("---")
+    st.info("Tip: Go to the Lessons tab to open a lesson. Mark it complete after practicing.")
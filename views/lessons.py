@@ -0,0 +1,109 @@
+"""Lessons page: open a single lesson or browse them all."""
+import streamlit as st
+
+import app_state
+from app_state import mark_completed
+from languages import language_name, pair_text
+from lesson_browser import (PAGE_SIZES, STATUS_OPTIONS, filter_lessons, lesson_label,
+                            page_count, page_slice)
+from search_index import get_search_index
+
+WORD_RESULTS = 20
+
+
+def render():
+    content = app_state.content()
+    lessons = content.lessons
+    lesson_map = content.lesson_by_id
+    native, learning = app_state.language_pair()
+
+    def item_line(idx, item):
+        native_text, learning_text = pair_text(item, native, learning)
+        return f"{idx}. **{native_text}** → *{learning_text}*"
+
+    # ================== SESSION STATE ==================
+    if "_selected_lesson" not in st.session_state:
+        st.session_state._selected_lesson = None
+
+    # ================== LESSONS PAGE ==================
+    st.header("📚 Lessons")
+
+    # ---- Vocabulary search (inverted index over every item) ----
+    word_query = st.text_input("🔎 Find a word", key="word_search",
+                               placeholder=f"{language_name(native)} or {language_name(learning)}, "
+                                           "e.g. danke, strasse, good mor")
+    if word_query.strip():
+        hits = get_search_index(content).search(word_query, limit=WORD_RESULTS)
+        if not hits:
+            st.caption("No lesson teaches that word yet.")
+        for hit_lesson, item_index, item in hits:
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                native_text, learning_text = pair_text(item, native, learning)
+                st.write(f"**{native_text}** → *{learning_text}* — {lesson_label(content, hit_lesson)}")
+            with col2:
+                if st.button("Open", key=f"word_open_{hit_lesson}_{item_index}"):
+                    st.session_state._selected_lesson = hit_lesson
+                    st.rerun()
+        st.markdown("---")
+
+    # Handle preselection (from Home if needed) — O(1) via the id→position index
+    default_index = 0
+    preselected = st.session_state.get("_selected_lesson")
+    if preselected is not None:
+        position = content.lesson_position.get(preselected)
+        default_index = position + 1 if position is not None else 0
+        st.session_state._selected_lesson = None
+
+    # ---- Single lesson dropdown ----
+    lesson_id = st.selectbox(
+        "Select a lesson",
+        (None,) + content.lesson_ids,
+        index=default_index,
+        format_func=lambda lid: "-- choose --" if lid is None else lesson_label(content, lid)
+    )
+
+    if lesson_id is not None:
+        lesson = lesson_map[lesson_id]
+
+        st.subheader(f"Lesson {lesson_id} — {lesson['title']}")
+        st.caption("Practice these words/phrases:")
+
+        # ✅ Show ALL items in lesson (no slicing)
+        for idx, item in enumerate(lesson.get("content", []), start=1):
+            st.write(item_line(idx, item))
+
+        # Only show "Mark lesson complete" button (quiz button removed)
+        if st.button("Mark lesson complete", key=f"complete_{lesson_id}"):
+            mark_completed(lesson_id)
+            st.success("Lesson marked complete ✅")
+
+    st.markdown("---")
+    # ---- Browse lessons (search + filter + pagination) ----
+    st.subheader("All lessons")
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        query = st.text_input("Search lessons", key="lessons_query", placeholder="Title or a word in any language")
+    with col2:
+        status = st.selectbox("Show", STATUS_OPTIONS, key="lessons_status")
+    with col3:
+        page_size = st.selectbox("Per page", PAGE_SIZES, key="lessons_page_size")
+
+    matching = filter_lessons(content, query, status, st.session_state.completed)
+    pages = page_count(len(matching), page_size)
+    current_page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1,
+                                   key="lessons_page") if pages > 1 else 1
+    st.caption(f"{len(matching)} of {len(lessons)} lessons")
+
+    # Only the visible page gets widgets
+    for lid in page_slice(matching, current_page, page_size):
+        l = lesson_map[lid]
+        with st.expander(lesson_label(content, lid)):
+            for idx, item in enumerate(l.get("content", []), start=1):
+                st.write(item_line(idx, item))
+
+            # Only show "Mark complete" button (quiz button removed)
+            if st.button("Mark complete", key=f"exp_complete_{lid}"):
+                mark_completed(lid)
+                st.success("Marked complete ✅")
+                st.rerun()
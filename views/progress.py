@@ -0,0 +1,36 @@
+"""Progress page: completion overview and bulk reset/complete."""
+import streamlit as st
+
+import app_state
+from app_state import set_completed
+
+
+def render():
+    content = app_state.content()
+
+    st.header("📈 Your Progress")
+
+    completed = st.session_state.completed
+    pct = int(completed.ratio * 100)
+
+    st.metric("Lessons completed", f"{len(completed)}/{completed.total}", delta=f"{pct}%")
+    st.progress(pct)
+
+    st.markdown("---")
+    st.subheader("Lesson Status")
+
+    # Show each lesson and its status
+    for lesson_id, title in zip(content.lesson_ids, content.lesson_titles):
+        status = "✅ Completed" if lesson_id in completed else "◻️ Not started"
+        st.write(f"**Lesson {lesson_id}: {title}** — *{status}*")
+
+    st.markdown("---")
+    # Reset progress button
+    if st.button("Reset progress"):
+        set_completed(())
+        st.success("All lesson progress has been reset.")
+
+    # Mark all lessons complete button
+    if st.button("Mark all lessons as completed"):
+        set_completed(content.lesson_ids)
+        st.success("All lessons marked as completed ✅")
@@ -0,0 +1,131 @@
+"""Quiz page: the quiz collection or a quiz generated from a lesson."""
+import streamlit as st
+
+import app_state
+from app_state import review_cards
+from lesson_browser import lesson_label, page_count
+from progress_store import get_progress_store
+from quiz_engine import QuizBook, QuizSession
+from quiz_gen import QuizGenerator
+
+QUESTIONS_PER_PAGE = 10
+
+
+def render():
+    content = app_state.content()
+
+    st.subheader("📝 Take a Quiz")
+
+    source = st.radio("Quiz source", ["Quiz collection", "Generate from a lesson"], horizontal=True)
+
+    if source == "Quiz collection":
+        quiz_book = content.derived("quiz_book", lambda c: QuizBook(c.quizzes))
+        if not quiz_book.ids:
+            st.info("No quizzes available yet.")
+            st.stop()
+        # Dropdown over quiz ids (no parsing the id back out of the title)
+        quiz_id = st.selectbox("Choose a quiz:", quiz_book.ids,
+                               format_func=lambda qid: f"{qid}. {quiz_book.by_id[qid]['title']}")
+    else:
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            gen_lesson = st.selectbox("Lesson", content.lesson_ids,
+                                      format_func=lambda lid: lesson_label(content, lid))
+        with col2:
+            gen_count = st.number_input("Questions", min_value=1, max_value=500, value=10)
+        with col3:
+            gen_seed = st.number_input("Seed", min_value=0, value=0)
+        pair = app_state.language_pair()
+        params = (content.version, gen_lesson, gen_count, gen_seed, pair)
+        if st.session_state.get("generated_quiz_params") != params:
+            # Distractor pools are built once per content version and pair, shared by every session
+            generator = content.derived(f"quiz_generator:{pair[0]}:{pair[1]}",
+                                        lambda c: QuizGenerator(c.lessons, languages=pair))
+            generated = generator.lesson_quiz(
+                gen_lesson, f"Practice: {content.title(gen_lesson)}", count=gen_count, seed=gen_seed)
+            st.session_state.generated_quiz_book = QuizBook([generated])
+            st.session_state.generated_quiz_params = params
+            st.session_state.quiz_session = None
+        quiz_book = st.session_state.generated_quiz_book
+        quiz_id = quiz_book.ids[0]
+        if not quiz_book.by_id[quiz_id]["questions"]:
+            st.info("This lesson has no items to build questions from.")
+            st.stop()
+    quiz = quiz_book.by_id[quiz_id]
+
+    # One QuizSession per selected quiz; it survives reruns
+    session = st.session_state.get("quiz_session")
+    if session is None or session.quiz_id != quiz_id:
+        session = st.session_state.quiz_session = QuizSession(quiz_id)
+        st.session_state.quiz_attempt = st.session_state.get("quiz_attempt", 0) + 1
+    attempt = st.session_state.quiz_attempt
+
+    def record_answer(index, key):
+        session.answer(index, st.session_state[key])
+
+    st.markdown(f"### {quiz['title']}")
+    questions = quiz["questions"]
+    total = len(questions)
+
+    # Long quizzes are shown a page at a time so reruns stay cheap
+    pages = page_count(total, QUESTIONS_PER_PAGE)
+    current_page = st.number_input(f"Questions page (of {pages})", min_value=1, max_value=pages, value=1,
+                                   key=f"quiz_page_{quiz_id}") if pages > 1 else 1
+    first = (current_page - 1) * QUESTIONS_PER_PAGE
+    result = session.result
+
+    for idx in range(first, min(first + QUESTIONS_PER_PAGE, total)):
+        q = questions[idx]
+        st.write(f"**Q{idx + 1}: {q['question']}**")
+        key = f"q{quiz_id}_{attempt}_{idx}"
+        if q.get("type") == "fill":
+            st.text_input(
+                f"Your answer for Q{idx + 1}:",
+                key=key,
+                on_change=record_answer,
+                args=(idx, key),
+                disabled=result is not None,
+            )
+        else:
+            st.radio(
+                f"Choose your answer for Q{idx + 1}:",
+                q["options"],
+                index=None,
+                key=key,
+                on_change=record_answer,
+                args=(idx, key),
+                disabled=result is not None,
+            )
+        if result is not None:
+            if result.correct[idx]:
+                st.success("✅ Correct!")
+            else:
+                st.error(f"❌ Wrong! Correct answer: {q['answer']}")
+
+    answered = len(session.answers)
+    if result is None:
+        st.caption(f"Answered {answered}/{total}")
+        if st.button("Submit quiz", key=f"submit_{quiz_id}_{attempt}"):
+            result = session.submit(quiz_book)
+            # Every question that maps to a lesson item counts as a review of that card
+            card_catalog = app_state.card_catalog()
+            graded = []
+            for q, correct in zip(questions, result.correct):
+                item = q.get("item")
+                card = card_catalog.number.get(tuple(item)) if item else card_catalog.find(q["answer"])
+                if card is not None:
+                    graded.append((card, "good" if correct else "again"))
+            review_cards(graded)
+            if st.session_state.user_id is not None:
+                get_progress_store().record_quiz_score(st.session_state.user_id, quiz_id, result.score, total)
+            st.rerun()
+    else:
+        st.info(f"Your final score: {result.score}/{result.total} ({result.percent:.0f}%)")
+        if session.seconds:
+            slowest = max(session.seconds, key=session.seconds.get)
+            st.caption(f"Time spent: {session.elapsed:.0f}s · "
+                       f"average {sum(session.seconds.values()) / len(session.seconds):.1f}s per answer · "
+                       f"slowest Q{slowest + 1} ({session.seconds[slowest]:.1f}s)")
+        if st.button("Retake quiz"):
+            st.session_state.quiz_session = None
+            st.rerun()
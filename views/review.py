@@ -0,0 +1,56 @@
+"""Review page: spaced-repetition flash cards."""
+import time
+
+import streamlit as st
+
+import app_state
+from app_state import introduce_lessons, review_cards
+from languages import pair_text
+from lesson_browser import lesson_label
+
+
+def render():
+    content = app_state.content()
+    lesson_map = content.lesson_by_id
+    card_catalog = app_state.card_catalog()
+
+    st.header("🔂 Review")
+    deck = app_state.deck()
+    card = deck.next_due(time.time())
+
+    if card is None:
+        st.success("All caught up — nothing is due right now. 🎉")
+        next_at = deck.next_due_at()
+        if next_at is not None:
+            minutes = max(0, (next_at - time.time()) / 60)
+            st.caption(f"Next card due in {minutes:.0f} min." if minutes < 120 else f"Next card due in {minutes / 60 / 24:.1f} days.")
+        if deck.introduced == 0:
+            st.info("Complete a lesson or take a quiz to add cards, or add a lesson's words below.")
+        lesson_to_add = st.selectbox("Add all words from a lesson", content.lesson_ids,
+                                     format_func=lambda lid: lesson_label(content, lid))
+        if st.button("Add to review"):
+            introduce_lessons([lesson_to_add])
+            st.rerun()
+    else:
+        item = card_catalog.item(card)
+        lesson_id = card_catalog.keys[card][0]
+        st.caption(f"From {lesson_label(content, lesson_id)}")
+        native_text, learning_text = pair_text(item, *app_state.language_pair())
+        st.subheader(native_text)
+        # Keyed by (lesson_id, index): card numbers change when the content does
+        if st.session_state.get("review_revealed") != card_catalog.keys[card]:
+            if st.button("Show answer"):
+                st.session_state.review_revealed = card_catalog.keys[card]
+                st.rerun()
+        else:
+            st.markdown(f"### *{learning_text}*")
+            cols = st.columns(4)
+            for col, grade in zip(cols, ("again", "hard", "good", "easy")):
+                with col:
+                    if st.button(grade.capitalize(), key=f"grade_{grade}"):
+                        review_cards([(card, grade)])
+                        st.session_state.review_revealed = None
+                        st.rerun()
+
+    st.markdown("---")
+    st.caption(f"{deck.introduced} of {len(card_catalog)} words in your review queue")
@@ -0,0 +1,110 @@
+"""Translator page: one-off and live translation through the backend chain."""
+from concurrent.futures import CancelledError, wait
+
+import streamlit as st
+
+import app_state
+import async_translate
+from languages import LANGUAGE_NAMES, language_name
+from live_translate import LiveTranslation
+from translation_cache import get_cache
+
+
+def render():
+    st.header("🔁 Translator")
+
+    # Input text (remember previous input)
+    text_input = st.text_input("Enter text to translate", key="translator_input")
+
+    # Direction: any pair; defaults to the session's languages
+    native, learning = app_state.language_pair()
+    languages = sorted(set(LANGUAGE_NAMES) | {native, learning}, key=language_name)
+    col1, col2 = st.columns(2)
+    with col1:
+        source = st.selectbox("From", languages, index=languages.index(native),
+                              format_func=language_name, key="translator_source")
+    with col2:
+        target = st.selectbox("To", languages, index=languages.index(learning),
+                              format_func=language_name, key="translator_target")
+
+    live_mode = st.toggle("Live translation", key="translator_live",
+                          help="Translate sentence by sentence as you edit, without pressing the button.")
+
+    if live_mode:
+        if "live_translation" not in st.session_state:
+            st.session_state.live_translation = LiveTranslation()
+        live = st.session_state.live_translation
+        live.update(text_input, target, source=source)
+
+        def show_live():
+            finished = live.poll()
+            if live.rendered:
+                st.subheader("Translation:")
+                st.success(live.rendered)
+            elif not live.finished():
+                st.info("Translating…")
+            if finished and st.session_state.get("live_polling"):
+                st.session_state.live_polling = False
+                st.rerun()          # full rerun stops the polling fragment
+
+        # Poll while waiting for the debounce or for pending sentences
+        polling = not live.poll()
+        st.session_state.live_polling = polling
+        if polling:
+            st.fragment(run_every=0.25)(show_live)()
+        else:
+            show_live()
+    else:
+        if "live_translation" in st.session_state:
+            st.session_state.live_translation.cancel()
+
+        def collect(fut):
+            st.session_state.translation_future = None
+            # Store in session_state so result persists after rerun
+            try:
+                st.session_state.translated_text = fut.result()
+            except CancelledError:      # cancelled by the sessions sharing it; no result
+                pass
+
+        # Button to trigger translation: the request runs on a shared background
+        # pool so this rerun returns immediately
+        if st.button("Translate"):
+            if not text_input.strip():
+                st.warning("Type something to translate.")
+            else:
+                fut = async_translate.submit(text_input, target, source)
+                # Local answers (dictionary, lessons, cache) are usually ready at once;
+                # show those in this run instead of starting the polling fragment
+                wait([fut], timeout=0.05)
+                st.session_state.translation_future = fut
+                if fut.done():
+                    collect(fut)
+
+        def show_translation():
+            fut = st.session_state.get("translation_future")
+            if fut is not None:
+                if not fut.done():
+                    st.info("Translating…")
+                    return
+                collect(fut)
+                if st.session_state.get("translation_polling"):
+                    st.session_state.translation_polling = False
+                    st.rerun()          # full rerun stops the polling fragment
+            if "translated_text" in st.session_state:
+                st.subheader("Translation:")
+                st.success(st.session_state.translated_text)
+
+        # Show translation if available; poll only while a request is pending
+        pending = st.session_state.get("translation_future") is not None
+        st.session_state.translation_polling = pending
+        if pending:
+            st.fragment(run_every=0.3)(show_translation)()
+        else:
+            show_translation()
+
+    # Cache counters (shared by every session in this process)
+    stats = get_cache().snapshot()
+    st.caption(
+        f"Translation cache: {stats['hits']} memory hits · {stats['disk_hits']} disk hits · "
+        f"{stats['misses']} misses · hit rate {stats['hit_rate']:.0%}"
+    )